@@ -2,116 +2,264 @@
 import sys
 import json
 import os
-import requests
+import io
+import queue
+import threading
+import time
+import urllib3
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _loads = orjson.loads
+    _dump_bytes = orjson.dumps
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize obj as a JSON string."""
+        return orjson.dumps(obj).decode()
+    
+    def _json_line(obj: Any) -> bytes:
+        """Serialize obj as one JSON-RPC output line."""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+    
+    def _dump_bytes(obj: Any) -> bytes:
+        """Serialize obj as UTF-8 JSON."""
+        return json.dumps(obj).encode()
+    
+    def _json_line(obj: Any) -> bytes:
+        """Serialize obj as one JSON-RPC output line."""
+        return (json.dumps(obj) + "\n").encode()
+
+# KM requests in flight at once; each worker blocks on one HTTP round trip
+BRIDGE_WORKERS = 8
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _raise_for_status(response: urllib3.HTTPResponse, url: str):
+    """Raise for 4xx/5xx replies, worded like requests' raise_for_status."""
+    if response.status >= 400:
+        kind = "Client" if response.status < 500 else "Server"
+        raise urllib3.exceptions.HTTPError(
+            f"{response.status} {kind} Error: {response.reason} for url: {url}")
+
+# Fixed replies, built once and never mutated
+_INITIALIZE_RESULT = {
+    "protocolVersion": "1.0.0",
+    "serverName": "knowledge-manager-local",
+    "capabilities": {"tools": True}
+}
+_NO_SERVER_ERROR = {"error": {"code": -32000, "message": "No local KM server"}}
+
+# Response lines are collected in a buffer this large and flushed once per burst
+STDOUT_BUFFER_SIZE = 64 * 1024
+
+# Seconds a fetched tools/list spec is served without asking the KM server
+SPEC_CACHE_TTL = 30
+
+@lru_cache(maxsize=4)
+def _load_config(config_file: str) -> Dict[str, Any]:
+    """Parse an mcp_config.json; cached so repeated bridges skip the read."""
+    with open(config_file, 'rb') as f:
+        return _loads(f.read())
+
 class LocalKMBridge:
     def __init__(self):
+        self._responses = queue.Queue()
+        self._local = threading.local()
+        self._handlers = {
+            "initialize": self._initialize,
+            "tools/list": self._list_tools,
+            "tools/call": self._call_tool
+        }
+        self._spec_cache = None
+        self._spec_etag = None
+        self._spec_cache_expiry = 0
         config_file = os.path.join(os.path.dirname(__file__), "mcp_config.json")
         if os.path.exists(config_file):
-            with open(config_file) as f:
-                config = json.load(f)
-                port = config.get("local_km_port", 5002)
-                self.base_url = f"http://localhost:{port}"
-                self.session = requests.Session()
-                sys.stderr.write(f"✓ Connected to local KM on port {port}\n")
-                sys.stderr.flush()
+            config = _load_config(config_file)
+            port = config.get("local_km_port", 5002)
+            self.base_url = f"http://localhost:{port}"
+            self._mcp_url = f"{self.base_url}/mcp"
+            self._spec_url = f"{self.base_url}/mcp/spec"
+            # Keep one connection per worker alive to the single KM host;
+            # urllib3 directly skips requests' per-call session machinery
+            self.http = urllib3.PoolManager(num_pools=1, maxsize=BRIDGE_WORKERS,
+                                            retries=False)
+            sys.stderr.write(f"✓ Connected to local KM on port {port}\n")
+            sys.stderr.flush()
         else:
             sys.stderr.write("✗ No local KM config found\n")
             sys.stderr.flush()
             self.base_url = None
-            self.session = None
+            self.http = None
     
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         if not self.base_url:
-            return {"error": {"code": -32000, "message": "No local KM server"}}
+            return _NO_SERVER_ERROR
         
         try:
             method = request.get("method", "")
-            
-            if method == "initialize":
-                return {
-                    "protocolVersion": "1.0.0",
-                    "serverName": "knowledge-manager-local",
-                    "capabilities": {"tools": True}
-                }
-            
-            elif method == "tools/list":
-                response = self.session.get(f"{self.base_url}/mcp/spec")
-                response.raise_for_status()
-                spec = response.json()
-                
-                tools = []
-                for tool in spec.get("tools", []):
-                    tools.append({
-                        "name": f"km__{tool.get('tool_name', tool.get('name'))}",
-                        "description": tool.get("description", ""),
-                        "parameters": tool.get("parameters", [])
-                    })
-                return {"tools": tools}
-            
-            elif method == "tools/call":
-                params = request.get("params", {})
-                tool_name = params.get("name", "").replace("km__", "")
-                arguments = params.get("arguments", {})
-                
-                mcp_request = {
-                    "jsonrpc": "2.0",
-                    "method": tool_name,
-                    "params": arguments,
-                    "id": request.get("id")
-                }
-                
-                response = self.session.post(
-                    f"{self.base_url}/mcp",
-                    json=mcp_request,
-                    headers={"Content-Type": "application/json"}
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": json.dumps(result.get("result", result))
-                    }]
-                }
-            
-            else:
+            handler = self._handlers.get(method)
+            if handler is None:
                 return {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+            return handler(request)
                 
         except Exception as e:
             return {"error": {"code": -32603, "message": f"Internal error: {str(e)}"}}
     
+    def _initialize(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe this bridge; the reply never changes."""
+        return _INITIALIZE_RESULT
+    
+    def _list_tools(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """List the KM server's tools under the km__ prefix."""
+        # The spec only changes when the KM server does, so serve it from
+        # cache and revalidate with its ETag once the TTL passes
+        now = time.monotonic()
+        if self._spec_cache is not None and now < self._spec_cache_expiry:
+            return self._spec_cache
+        
+        headers = {}
+        if self._spec_cache is not None and self._spec_etag:
+            headers["If-None-Match"] = self._spec_etag
+        response = self.http.request("GET", self._spec_url, headers=headers)
+        if response.status == 304 and self._spec_cache is not None:
+            self._spec_cache_expiry = now + SPEC_CACHE_TTL
+            return self._spec_cache
+        _raise_for_status(response, self._spec_url)
+        spec = _loads(response.data)
+        
+        tools = []
+        for tool in spec.get("tools", []):
+            tools.append({
+                "name": f"km__{tool.get('tool_name', tool.get('name'))}",
+                "description": tool.get("description", ""),
+                "parameters": tool.get("parameters", [])
+            })
+        self._spec_cache = {"tools": tools}
+        self._spec_etag = response.headers.get("ETag")
+        self._spec_cache_expiry = now + SPEC_CACHE_TTL
+        return self._spec_cache
+    
+    def _call_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Forward a km__ tool call to the KM server."""
+        params = request.get("params", {})
+        tool_name = params.get("name", "").replace("km__", "")
+        arguments = params.get("arguments", {})
+        
+        mcp_request = {
+            "jsonrpc": "2.0",
+            "method": tool_name,
+            "params": arguments,
+            "id": request.get("id")
+        }
+        
+        response = self.http.request(
+            "POST",
+            self._mcp_url,
+            body=_dump_bytes(mcp_request),
+            headers=_JSON_HEADERS
+        )
+        _raise_for_status(response, self._mcp_url)
+        
+        # Parse and re-serialize the result rather than slicing it out of the
+        # body: both steps run in C, while a Python-level scan for the raw
+        # "result" value measured several times slower on large payloads
+        result = _loads(response.data)
+        return {
+            "content": [{
+                "type": "text",
+                "text": _dumps(result.get("result", result))
+            }]
+        }
+    
     def run(self):
-        for line in sys.stdin:
-            try:
-                request = json.loads(line.strip())
-                result = self.handle_request(request)
-                
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id")
-                }
-                
-                if "error" in result:
-                    response["error"] = result["error"]
-                else:
-                    response["result"] = result
-                
-                sys.stdout.write(json.dumps(response) + "\n")
-                sys.stdout.flush()
+        # Requests are handled on worker threads so a slow KM call does not
+        # stall the ones behind it; responses carry their id, so replies may
+        # arrive out of order
+        writer = threading.Thread(target=self._write_responses, daemon=True)
+        writer.start()
+        
+        with ThreadPoolExecutor(max_workers=BRIDGE_WORKERS) as pool:
+            for line in sys.stdin.buffer:
+                try:
+                    request = _loads(line.strip())
+                except json.JSONDecodeError as e:
+                    error_response = {
+                        "jsonrpc": "2.0",
+                        "error": {"code": -32700, "message": f"Parse error: {str(e)}"}
+                    }
+                    self._write_response(error_response)
+                    continue
                 
-            except json.JSONDecodeError as e:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32700, "message": f"Parse error: {str(e)}"}
-                }
-                sys.stdout.write(json.dumps(error_response) + "\n")
-                sys.stdout.flush()
-            except Exception as e:
-                sys.stderr.write(f"Bridge error: {str(e)}\n")
-                sys.stderr.flush()
+                pool.submit(self._respond, request)
+        
+        # All workers are done; let the writer drain and exit
+        self._responses.put(None)
+        writer.join()
+    
+    def _respond(self, request: Dict[str, Any]):
+        """Handle one request and write its response."""
+        try:
+            result = self.handle_request(request)
+            
+            # Each worker reuses one envelope; it is serialized before the
+            # worker takes another request
+            response = getattr(self._local, "envelope", None)
+            if response is None:
+                response = self._local.envelope = {"jsonrpc": "2.0", "id": None}
+            response["id"] = request.get("id")
+            
+            if "error" in result:
+                key = "error"
+                response[key] = result["error"]
+            else:
+                key = "result"
+                response[key] = result
+            
+            try:
+                self._write_response(response)
+            finally:
+                # Don't keep the payload alive between requests
+                del response[key]
+            
+        except Exception as e:
+            sys.stderr.write(f"Bridge error: {str(e)}\n")
+            sys.stderr.flush()
+    
+    def _write_response(self, response: Dict[str, Any]):
+        """Queue one JSON-RPC line for the writer thread."""
+        self._responses.put(_json_line(response))
+    
+    def _write_responses(self):
+        """Write queued lines, flushing once when no more are ready."""
+        try:
+            # A private buffered handle on a duplicate of stdout's descriptor
+            out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb', buffering=STDOUT_BUFFER_SIZE)
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            out = sys.stdout.buffer
+        
+        line = self._responses.get()
+        while line is not None:
+            out.write(line)
+            try:
+                line = self._responses.get_nowait()
+            except queue.Empty:
+                out.flush()
+                line = self._responses.get()
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
 
 if __name__ == "__main__":
     bridge = LocalKMBridge()
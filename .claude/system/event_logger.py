@@ -1,35 +1,109 @@
 #!/usr/bin/env python3
 import json
 import time
+import atexit
 import hashlib
+import itertools
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import fcntl  # For file locking
 from logger_config import get_contextual_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    def _event_line(event: Dict[str, Any]) -> bytes:
+        """Serialize an event as one NDJSON line."""
+        return orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+else:
+    def _event_line(event: Dict[str, Any]) -> bytes:
+        """Serialize an event as one NDJSON line."""
+        return (json.dumps(event) + '\n').encode()
+
 class EventLogger:
-    def __init__(self, log_path: str = ".claude/events/log.ndjson"):
+    _shared: Dict[str, "EventLogger"] = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, log_path: str = ".claude/events/log.ndjson", keep_open: bool = False):
         self.log_path = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        self._counter = 0
+        # next() on a count is atomic, so threads sharing a logger never
+        # draw the same event ID suffix
+        self._counter = itertools.count(1)
         self.logger = get_contextual_logger("event_logger", component="event_logger")
         
-    def append_event(self, 
+        # Persistent O_APPEND descriptor, opened on first write when keep_open
+        self.keep_open = keep_open
+        self._fd = None
+        self._fd_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls, log_path: str = ".claude/events/log.ndjson") -> "EventLogger":
+        """
+        Return the process-wide logger for a log path.
+        
+        The path is resolved once, so the shared logger keeps writing to the
+        same file through its open descriptor even if the working directory
+        changes.
+        """
+        key = os.path.abspath(log_path)
+        with cls._shared_lock:
+            logger = cls._shared.get(key)
+            if logger is None:
+                logger = cls(key, keep_open=True)
+                cls._shared[key] = logger
+            return logger
+    
+    @classmethod
+    def close_shared(cls):
+        """Close and forget every shared logger; registered to run at exit."""
+        with cls._shared_lock:
+            loggers = list(cls._shared.values())
+            cls._shared.clear()
+        for logger in loggers:
+            logger.close()
+    
+    def close(self):
+        """Close the persistent descriptor, if one is open."""
+        with self._fd_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+    
+    def _append_fd(self) -> int:
+        """Return the persistent descriptor, reopening it if the log was unlinked."""
+        if self._fd is not None and os.fstat(self._fd).st_nlink == 0:
+            os.close(self._fd)
+            self._fd = None
+        if self._fd is None:
+            self._fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+        
+    def build_event(self,
                     ticket_id: str,
                     event_type: str,
                     payload: Dict[str, Any],
                     parent_event_id: Optional[str] = None,
-                    agent: Optional[str] = None) -> str:
-        """Append event atomically with write-lock."""
+                    agent: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build an event record with a fresh event ID.
+        
+        Callers that buffer events should build them as they happen, so
+        each keeps its own timestamp, and write them with append_built_events.
+        """
         
         # Generate event ID
         timestamp = int(time.time() * 1000)
-        self._counter += 1
-        event_id = f"evt_{timestamp}_{self._counter:04d}"
+        event_id = f"evt_{timestamp}_{next(self._counter):04d}"
         
         # Build event
-        event = {
+        return {
             "event_id": event_id,
             "ticket_id": ticket_id,
             "parent_event_id": parent_event_id or "",
@@ -42,17 +116,47 @@ class EventLogger:
             ).hexdigest(),
             "idempotency_key": f"{ticket_id}_{event_type}_{timestamp}"
         }
+    
+    def _write_events(self, events: List[Dict[str, Any]], sync: bool = True):
+        """Append serialized events under a single lock, fsyncing if requested."""
+        if self.keep_open:
+            data = b"".join(map(_event_line, events))
+            with self._fd_lock:
+                fd = self._append_fd()
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    if sync:
+                        os.fsync(fd)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            return
+        
+        with open(self.log_path, 'ab') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.writelines(map(_event_line, events))
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())  # Force write to disk
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def append_event(self, 
+                    ticket_id: str,
+                    event_type: str,
+                    payload: Dict[str, Any],
+                    parent_event_id: Optional[str] = None,
+                    agent: Optional[str] = None) -> str:
+        """Append event atomically with write-lock."""
+        event = self.build_event(ticket_id, event_type, payload, parent_event_id, agent)
+        event_id = event["event_id"]
         
         # Atomic append with lock
         try:
-            with open(self.log_path, 'a') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                try:
-                    f.write(json.dumps(event) + '\n')
-                    f.flush()
-                    os.fsync(f.fileno())  # Force write to disk
-                finally:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            self._write_events([event])
             
             self.logger.debug("Event logged", extra={
                 'event_id': event_id,
@@ -72,6 +176,51 @@ class EventLogger:
         
         return event_id
     
+    def append_events(self, events: List[Dict[str, Any]], sync: bool = True) -> List[str]:
+        """
+        Append several events with one lock, write and fsync.
+        
+        Args:
+            events: Dicts with the keyword arguments accepted by append_event
+            sync: Whether to fsync after writing; callers that sync at a
+                later boundary can pass False
+            
+        Returns:
+            Event IDs in the same order as the input
+        """
+        return self.append_built_events([self.build_event(**event) for event in events], sync)
+    
+    def append_built_events(self, built: List[Dict[str, Any]], sync: bool = True) -> List[str]:
+        """
+        Append events returned by build_event with one lock, write and fsync.
+        
+        Args:
+            built: Event records from build_event
+            sync: Whether to fsync after writing
+            
+        Returns:
+            Event IDs in the same order as the input
+        """
+        if not built:
+            return []
+        
+        try:
+            self._write_events(built, sync)
+            
+            self.logger.debug("Events logged", extra={
+                'event_count': len(built),
+                'first_event_id': built[0]["event_id"]
+            })
+            
+        except Exception as e:
+            self.logger.error("Failed to log events", extra={
+                'event_count': len(built),
+                'error': str(e)
+            })
+            raise
+        
+        return [event["event_id"] for event in built]
+    
     def replay_events(self, 
                      ticket_id: Optional[str] = None,
                      from_timestamp: Optional[int] = None,
@@ -233,6 +382,9 @@ class EventLogger:
             
         return count
 
+# Shared loggers keep their descriptor open for the life of the process
+atexit.register(EventLogger.close_shared)
+
 if __name__ == "__main__":
     # CLI interface for bash integration
     import sys
@@ -9,11 +9,22 @@ from datetime import datetime, timedelta
 import re
 from logger_config import get_contextual_logger
 
+# Prepared statements kept per connection; callers such as the write
+# protocol share this connection and add their own queries
+STATEMENT_CACHE_SIZE = 256
+
+# Host parameters allowed per statement by SQLite builds before 3.32
+SQLITE_MAX_VARIABLES = 999
+
 class FileRegistry:
-    def __init__(self, db_path: str = ".claude/registry/registry.db"):
+    def __init__(self, db_path: str = ".claude/registry/registry.db", uri: bool = False):
+        # uri=True treats db_path as an SQLite URI, e.g. a shared-cache
+        # in-memory database for tests
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
+        if not uri:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path if uri else str(self.db_path),
+                                    cached_statements=STATEMENT_CACHE_SIZE, uri=uri)
         self.conn.row_factory = sqlite3.Row
         self._initialize_db()
         self._load_conventions()
@@ -265,6 +276,73 @@ class FileRegistry:
         self.conn.commit()
         return cursor.rowcount > 0
     
+    def acquire_locks(self, paths: List[str], ticket_id: str, duration_seconds: int = 600) -> bool:
+        """
+        Acquire advisory locks on several files in one transaction.
+        
+        Either every lock is taken or none is: the conflict check and the
+        writes share a single BEGIN IMMEDIATE, so no other connection can
+        lock one of the paths in between.
+        
+        Returns:
+            False if another ticket holds an unexpired lock on any path
+            
+        Raises:
+            RuntimeError: If the connection already has a transaction open,
+                which this method would otherwise commit or roll back
+        """
+        paths = list(paths)
+        if not paths:
+            return True
+        if self.conn.in_transaction:
+            raise RuntimeError("acquire_locks needs a connection with no open transaction")
+        
+        now = datetime.now()
+        expiry = (now + timedelta(seconds=duration_seconds)).isoformat()
+        cursor = self.conn.cursor()
+        
+        # Two parameters besides the paths: the ticket and the current time
+        chunk_size = SQLITE_MAX_VARIABLES - 2
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for start in range(0, len(paths), chunk_size):
+                chunk = paths[start:start + chunk_size]
+                cursor.execute("""
+                    SELECT path FROM files
+                    WHERE path IN (%s)
+                        AND lock_status = 'locked'
+                        AND lock_owner != ?
+                        AND lock_expiry > ?
+                """ % ",".join("?" * len(chunk)), (*chunk, ticket_id, now.isoformat()))
+                
+                if cursor.fetchone():
+                    self.conn.rollback()
+                    return False
+            
+            # Existing rows keep their registration data; the rest get the
+            # same placeholder rows acquire_lock creates
+            cursor.executemany("""
+                UPDATE files
+                SET lock_status = 'locked',
+                    lock_owner = ?,
+                    lock_expiry = ?
+                WHERE path = ?
+            """, [(ticket_id, expiry, path) for path in paths])
+            cursor.executemany("""
+                INSERT OR IGNORE INTO files (path, canonical_path, content_hash, ticket_id,
+                                 job_id, agent_name, last_event_id, lock_status,
+                                 lock_owner, lock_expiry)
+                VALUES (?, ?, '', ?, '', '', '', 'locked', ?, ?)
+            """, [(path, path, ticket_id, ticket_id, expiry) for path in paths])
+            
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return True
+    
     def register_file(self, 
                      path: str,
                      content_hash: str,
@@ -298,6 +376,49 @@ class FileRegistry:
         self.conn.commit()
         return True
     
+    def register_files(self, files: List[Dict]) -> int:
+        """
+        Register several files, and their dependencies, in one transaction.
+        
+        Args:
+            files: Dicts with the keyword arguments accepted by register_file
+            
+        Returns:
+            Number of files registered
+        """
+        now = datetime.now().isoformat()
+        file_rows = []
+        dependency_rows = []
+        
+        for entry in files:
+            path = entry['path']
+            component = entry.get('component')
+            file_rows.append((
+                path, self.canonicalize_path(path, component or "unknown"),
+                entry['content_hash'], entry['ticket_id'], entry['job_id'],
+                entry['agent_name'], component, entry['event_id'], now
+            ))
+            for dep_path in entry.get('dependencies') or ():
+                dependency_rows.append((path, dep_path))
+        
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            INSERT OR REPLACE INTO files 
+            (path, canonical_path, content_hash, ticket_id, job_id, 
+             agent_name, component, last_event_id, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, file_rows)
+        
+        if dependency_rows:
+            cursor.executemany("""
+                INSERT OR IGNORE INTO file_relationships
+                (source_file, target_file, relationship_type, strength)
+                VALUES (?, ?, 'imports', 5)
+            """, dependency_rows)
+        
+        self.conn.commit()
+        return len(file_rows)
+    
     def register_component_dependency(self, 
                                     source_component: str,
                                     target_component: str,
@@ -314,6 +435,27 @@ class FileRegistry:
         self.conn.commit()
         return cursor.rowcount > 0
     
+    def register_component_dependencies(self, dependencies: List[Tuple[str, str, str, str]]) -> int:
+        """
+        Register several component-level dependencies in one transaction.
+        
+        Args:
+            dependencies: (source_component, target_component, dependency_type,
+                ticket_id) tuples, as passed to register_component_dependency
+            
+        Returns:
+            Number of dependencies that were not already registered
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            INSERT OR IGNORE INTO dependencies
+            (source_component, target_component, dependency_type, ticket_id)
+            VALUES (?, ?, ?, ?)
+        """, dependencies)
+        
+        self.conn.commit()
+        return cursor.rowcount
+    
     def check_duplicate(self, content_hash: str) -> Optional[str]:
         """Check if file with same content already exists."""
         cursor = self.conn.cursor()
@@ -1,14 +1,141 @@
 #!/usr/bin/env python3
 import json
+import os
+import re
 import subprocess
 import shutil
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
 from write_protocol import ThreePhaseWriter
 from file_registry import FileRegistry
 from event_logger import EventLogger
 
+# Threads reading and scanning changed files; both the reads and the
+# relative-import lookups are I/O
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Concurrent register_api calls to the Knowledge Manager; also the size
+# of the HTTP session's connection pool
+KM_WORKERS = 8
+
+# (connect, read) timeouts for KM calls; a KM that is down fails fast, while
+# a save that encodes embeddings keeps the full 5 s to respond
+KM_TIMEOUT = (0.5, 5.0)
+
+# Like git, treat a file with a NUL byte this early on as binary
+BINARY_PROBE_BYTES = 8192
+
+# ES6 imports (with or without bindings) and CommonJS requires in one pass;
+# the lazy optional group tries the bare `import './x'` form first
+_IMPORT_PATTERN = re.compile(
+    r'import\s+(?:.*?from\s+)??[\'"]([^\'"\s]+)[\'"]'
+    r'|require\([\'"]([^\'"\s]+)[\'"]\)',
+    re.MULTILINE
+)
+
+# Exported functions/classes, consts and export lists
+_EXPORT_PATTERNS = [
+    re.compile(r'export\s+(?:default\s+)?(?:function|class)\s+(\w+)', re.MULTILINE),
+    re.compile(r'export\s+const\s+(\w+)\s*=', re.MULTILINE),
+    re.compile(r'export\s*{\s*([^}]+)\s*}', re.MULTILINE),
+]
+
+# Start of an interface declaration; the body is found by brace matching
+_INTERFACE_HEADER = re.compile(r'interface\s+(\w+)\s*{')
+
+# Paths containing any of these fragments are never integrated
+_IGNORE_PATTERN = re.compile('|'.join(re.escape(fragment) for fragment in (
+    '.git', 'node_modules', '__pycache__', '.DS_Store',
+    '.tmp', '.backup', 'tmp'
+)))
+
+def _find_interfaces(content: str) -> List[Tuple[str, str]]:
+    """Find (name, body) for each interface, including nested object types."""
+    interfaces = []
+    pos = 0
+    while True:
+        header = _INTERFACE_HEADER.search(content, pos)
+        if header is None:
+            return interfaces
+        
+        # Walk brace to brace until the one closing the declaration
+        depth = 1
+        i = header.end()
+        while depth:
+            close = content.find('}', i)
+            if close == -1:
+                # Unterminated declaration
+                return interfaces
+            opening = content.find('{', i, close)
+            if opening == -1:
+                depth -= 1
+                i = close + 1
+            else:
+                depth += 1
+                i = opening + 1
+        
+        body = content[header.end():i - 1]
+        if body:
+            interfaces.append((header.group(1), body))
+        pos = i
+
+@lru_cache(maxsize=4096)
+def _infer_component(filepath: str) -> str:
+    """Infer component name from file path."""
+    parts = Path(filepath).parts
+    
+    # Look for common component indicators
+    if 'components' in parts:
+        idx = parts.index('components')
+        if idx + 1 < len(parts):
+            return parts[idx + 1]
+    
+    # Use directory name as component
+    if len(parts) > 1:
+        return parts[-2]  # Parent directory
+    
+    return "core"
+
+@lru_cache(maxsize=2048)
+def _dir_entries(directory: str) -> frozenset:
+    """Names in a directory, listed once and reused for every import probe."""
+    try:
+        with os.scandir(directory) as entries:
+            # is_file/is_dir follow symlinks, so dangling links are left out
+            return frozenset(
+                entry.name for entry in entries
+                if entry.is_file() or entry.is_dir()
+            )
+    except OSError:
+        return frozenset()
+
+@lru_cache(maxsize=8192)
+def _resolve_relative_import(source_dir: str, import_path: str) -> Optional[str]:
+    """Resolve relative import to actual file path."""
+    # Plain string normalization; import tracking doesn't need symlinks
+    # resolved, so this avoids realpath's per-component syscalls
+    resolved = os.path.abspath(os.path.join(source_dir, import_path))
+    parent, name = os.path.split(resolved)
+    names = _dir_entries(parent)
+    
+    # Add common extensions if missing
+    extensions = ['.ts', '.tsx', '.js', '.jsx']
+    if not os.path.splitext(name)[1]:
+        for ext in extensions:
+            if name + ext in names:
+                return resolved + ext
+    
+    return resolved if name in names else None
+
+def _clear_scan_caches():
+    """Forget directory listings and resolved imports from earlier scans."""
+    _dir_entries.cache_clear()
+    _resolve_relative_import.cache_clear()
+
 class Integrator:
     """
     Integrates validated workspace changes into the main repository.
@@ -20,6 +147,45 @@ class Integrator:
         self.registry = FileRegistry()
         self.logger = EventLogger()
         self.km_url = "http://localhost:5001/mcp"
+        
+        # Keep-alive session shared by the KM registration threads
+        self._http = requests.Session()
+        self._http.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=KM_WORKERS))
+        self._km_pool = None
+        
+        # Long-lived `git cat-file --batch` reader, spawned on first use;
+        # scan workers take turns on its pipe
+        self._cat_file = None
+        self._cat_file_cwd = None
+        self._cat_file_lock = threading.Lock()
+        
+        # Created on first use by _map_files
+        self._scan_pool = None
+    
+    def close(self):
+        """Release the cat-file reader, worker threads and HTTP session."""
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown()
+            self._scan_pool = None
+        if self._km_pool is not None:
+            self._km_pool.shutdown()
+            self._km_pool = None
+        self._http.close()
+        self._stop_cat_file()
+    
+    def _stop_cat_file(self):
+        """Terminate the cat-file reader if one is running."""
+        if self._cat_file is not None:
+            try:
+                self._cat_file.stdin.close()
+                self._cat_file.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._cat_file.kill()
+            self._cat_file = None
+            self._cat_file_cwd = None
+    
+    def __del__(self):
+        self.close()
     
     def prepare_integration(self, job_id: str, workspace_path: str) -> Tuple[List[Dict], List[str]]:
         """Prepare file intents for integration by analyzing workspace changes."""
@@ -31,145 +197,200 @@ class Integrator:
             errors.append(f"Workspace path does not exist: {workspace_path}")
             return intents, errors
         
-        # Get list of changed files using git
+        # Files may have appeared or gone since the last integration
+        _clear_scan_caches()
+        
+        # Get changed files with their blob ids; -z keeps unusual paths intact
         try:
             result = subprocess.run(
-                ["git", "diff", "--name-status", "HEAD"],
+                ["git", "diff", "--raw", "-z", "HEAD"],
                 cwd=workspace,
                 capture_output=True,
-                text=True,
                 check=True
             )
         except subprocess.CalledProcessError as e:
             # Fallback: scan for all files if git fails
             return self._fallback_file_scan(workspace)
         
-        for line in result.stdout.strip().split('\n'):
-            if not line:
+        fields = result.stdout.decode('utf-8', errors='surrogateescape').split('\0')
+        changes = []
+        i = 0
+        while i + 1 < len(fields):
+            meta = fields[i].split()
+            status = meta[4][0]
+            filepath = fields[i + 1]
+            i += 2
+            if status in ('R', 'C'):
+                # Renames and copies carry a second path
+                i += 1
                 continue
-            
-            parts = line.split('\t')
-            status = parts[0]
-            filepath = parts[1]
-            
-            if status == 'A' or status == 'M':
-                # Added or modified
-                full_path = workspace / filepath
-                if full_path.exists():
-                    try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                    except UnicodeDecodeError:
-                        # Skip binary files
-                        continue
-                    
-                    intent = {
-                        "operation": "create" if status == 'A' else "update",
-                        "path": filepath,
-                        "content": content,
-                        "component": self._infer_component(filepath),
-                        "dependencies": self._extract_dependencies(content, filepath)
-                    }
-                    intents.append(intent)
-            
-            elif status == 'D':
-                # Deleted
-                intent = {
-                    "operation": "delete",
-                    "path": filepath
-                }
-                intents.append(intent)
+            if status in ('A', 'M', 'D'):
+                changes.append((status, filepath, meta[3]))
         
+        build = partial(self._build_change_intent, workspace)
+        intents = [intent for intent in self._map_files(build, changes) if intent]
         return intents, errors
     
+    def _build_change_intent(self, workspace: Path, change: Tuple[str, str, str]) -> Optional[Dict]:
+        """Build the intent for one `git diff` row."""
+        status, filepath, sha = change
+        
+        if status == 'D':
+            # Deleted
+            return {
+                "operation": "delete",
+                "path": filepath
+            }
+        
+        # Added or modified
+        content = self._read_changed_file(workspace, filepath, sha)
+        if content is None:
+            # Missing or binary
+            return None
+        
+        return {
+            "operation": "create" if status == 'A' else "update",
+            "path": filepath,
+            "content": content,
+            "component": _infer_component(filepath),
+            "dependencies": self._extract_dependencies(content, filepath)
+        }
+    
+    def _map_files(self, func, items: List) -> List:
+        """Apply func to each item in order, on the scan threads when there are several."""
+        if len(items) < 2 or SCAN_WORKERS < 2:
+            return [func(item) for item in items]
+        if self._scan_pool is None:
+            self._scan_pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+        return list(self._scan_pool.map(func, items))
+    
+    def _read_changed_file(self, workspace: Path, filepath: str, sha: str) -> Optional[str]:
+        """Read a changed file, from the object store when git already hashed it."""
+        if sha.strip('0'):
+            data = self._read_blob(workspace, sha)
+            if data is not None:
+                if data.find(b'\0', 0, BINARY_PROBE_BYTES) != -1:
+                    # Skip binary files
+                    return None
+                return self._decode_text(data)
+        
+        # git reports a zero id for files that differ from the index
+        return self._read_text_file(workspace / filepath)
+    
+    def _read_text_file(self, path) -> Optional[str]:
+        """Read a text file, returning None for binary or unreadable files."""
+        try:
+            with open(path, 'rb') as f:
+                # Check the start before reading the rest of a binary file
+                data = f.read(BINARY_PROBE_BYTES)
+                if b'\0' in data:
+                    return None
+                rest = f.read()
+        except OSError:
+            return None
+        return self._decode_text(data + rest if rest else data)
+    
+    def _decode_text(self, data: bytes) -> Optional[str]:
+        """Decode UTF-8 file contents the way a text-mode read would."""
+        try:
+            content = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Skip binary files
+            return None
+        if '\r' in content:
+            # Match the newline translation of a text-mode read
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    def _read_blob(self, workspace: Path, sha: str) -> Optional[bytes]:
+        """Read one blob through the persistent cat-file process."""
+        with self._cat_file_lock:
+            if self._cat_file is None or self._cat_file_cwd != workspace:
+                self._stop_cat_file()
+                self._cat_file = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=workspace,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE
+                )
+                self._cat_file_cwd = workspace
+            
+            proc = self._cat_file
+            proc.stdin.write(sha.encode('ascii') + b'\n')
+            proc.stdin.flush()
+            # Response is "<sha> blob <size>\n<bytes>\n" or "<sha> missing\n"
+            header = proc.stdout.readline().split()
+            if len(header) != 3:
+                return None
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)
+            return data
+    
     def _fallback_file_scan(self, workspace: Path) -> Tuple[List[Dict], List[str]]:
         """Fallback method to scan workspace when git is not available."""
-        intents = []
         errors = []
-        
-        for file_path in workspace.rglob("*"):
-            if file_path.is_file() and not self._should_ignore_file(str(file_path)):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    relative_path = file_path.relative_to(workspace)
-                    intent = {
-                        "operation": "create",
-                        "path": str(relative_path),
-                        "content": content,
-                        "component": self._infer_component(str(relative_path)),
-                        "dependencies": self._extract_dependencies(content, str(relative_path))
-                    }
-                    intents.append(intent)
-                except (UnicodeDecodeError, PermissionError):
-                    continue
-        
+        _clear_scan_caches()
+        
+        # Walk with scandir so file types come from the directory entries
+        # instead of a stat and a Path object per file
+        workspace_str = str(workspace)
+        prefix_len = len(os.path.join(workspace_str, ''))
+        file_paths = []
+        stack = [workspace_str]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Every path below an ignored directory is ignored
+                        # too, so don't descend into it
+                        if not _IGNORE_PATTERN.search(entry.name):
+                            stack.append(entry.path)
+                    elif entry.is_file() and not self._should_ignore_file(entry.path):
+                        file_paths.append(entry.path)
+        
+        # Read and analyze the files on the scan threads
+        scan = partial(self._scan_file, prefix_len)
+        intents = [intent for intent in self._map_files(scan, file_paths) if intent]
         return intents, errors
     
+    def _scan_file(self, prefix_len: int, file_path: str) -> Optional[Dict]:
+        """Build the create intent for one file found by the fallback scan."""
+        content = self._read_text_file(file_path)
+        if content is None:
+            return None
+        
+        relative_path = file_path[prefix_len:]
+        return {
+            "operation": "create",
+            "path": relative_path,
+            "content": content,
+            "component": _infer_component(relative_path),
+            "dependencies": self._extract_dependencies(content, relative_path)
+        }
+    
     def _should_ignore_file(self, path: str) -> bool:
         """Check if file should be ignored during integration."""
-        ignored_patterns = [
-            '.git', 'node_modules', '__pycache__', '.DS_Store',
-            '.tmp', '.backup', 'tmp'
-        ]
-        return any(pattern in path for pattern in ignored_patterns)
-    
-    def _infer_component(self, filepath: str) -> str:
-        """Infer component name from file path."""
-        parts = Path(filepath).parts
-        
-        # Look for common component indicators
-        if 'components' in parts:
-            idx = parts.index('components')
-            if idx + 1 < len(parts):
-                return parts[idx + 1]
-        
-        # Use directory name as component
-        if len(parts) > 1:
-            return parts[-2]  # Parent directory
-        
-        return "core"
+        return _IGNORE_PATTERN.search(path) is not None
     
     def _extract_dependencies(self, content: str, filepath: str) -> List[str]:
         """Extract file dependencies from content."""
         dependencies = []
         
         # Extract import statements (JavaScript/TypeScript)
-        import re
-        
-        # ES6 imports
-        import_patterns = [
-            r'import\s+.*?from\s+[\'"]([^\'"\s]+)[\'"]',
-            r'import\s+[\'"]([^\'"\s]+)[\'"]',
-            r'require\([\'"]([^\'"\s]+)[\'"]\)',
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            for match in matches:
-                # Convert relative imports to file paths
-                if match.startswith('./') or match.startswith('../'):
-                    dep_path = self._resolve_relative_import(filepath, match)
-                    if dep_path:
-                        dependencies.append(dep_path)
+        for found in _IMPORT_PATTERN.finditer(content):
+            match = found.group(found.lastindex)
+            # Convert relative imports to file paths
+            if match.startswith('./') or match.startswith('../'):
+                dep_path = _resolve_relative_import(os.path.dirname(filepath), match)
+                if dep_path:
+                    dependencies.append(dep_path)
         
         return dependencies
     
-    def _resolve_relative_import(self, source_file: str, import_path: str) -> str:
-        """Resolve relative import to actual file path."""
-        source_dir = Path(source_file).parent
-        resolved = (source_dir / import_path).resolve()
-        
-        # Add common extensions if missing
-        extensions = ['.ts', '.tsx', '.js', '.jsx']
-        if not resolved.suffix:
-            for ext in extensions:
-                if (resolved.with_suffix(ext)).exists():
-                    return str(resolved.with_suffix(ext))
-        
-        return str(resolved) if resolved.exists() else None
-    
     def check_conflicts(self, workspace_path: str) -> List[str]:
         """Check for merge conflicts with main branch."""
         conflicts = []
@@ -183,36 +404,56 @@ class Integrator:
                 check=True
             )
             
-            # Try merge --no-commit to check for conflicts
+            # Merge in memory; the index and working tree are left untouched
             result = subprocess.run(
-                ["git", "merge", "--no-commit", "--no-ff", "origin/main"],
+                ["git", "merge-tree", "--write-tree", "--name-only", "-z", "HEAD", "origin/main"],
                 cwd=workspace_path,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
             
-            if result.returncode != 0:
-                # Get list of conflicted files
-                conflict_result = subprocess.run(
-                    ["git", "diff", "--name-only", "--diff-filter=U"],
-                    cwd=workspace_path,
-                    capture_output=True,
-                    text=True
-                )
-                conflicts = conflict_result.stdout.strip().split('\n')
-                
-                # Abort the merge
-                subprocess.run(
-                    ["git", "merge", "--abort"],
-                    cwd=workspace_path,
-                    capture_output=True
-                )
+            # Exit status 1 means conflicts; the conflicted paths follow the
+            # tree id and end at an empty field
+            if result.returncode == 1:
+                fields = result.stdout.decode('utf-8', errors='surrogateescape').split('\0')
+                conflicts = fields[1:fields.index('', 1)]
+            elif result.returncode != 0:
+                # Anything else means merge-tree could not run, e.g. git
+                # older than 2.38 has no --write-tree; probe with a real merge
+                conflicts = self._merge_conflicts(workspace_path)
         except subprocess.CalledProcessError:
             # Git operations failed, assume no conflicts
             pass
         
         return [c for c in conflicts if c]  # Filter empty strings
     
+    def _merge_conflicts(self, workspace_path: str) -> List[str]:
+        """List conflicts by attempting the merge in the workspace, then aborting it."""
+        result = subprocess.run(
+            ["git", "merge", "--no-commit", "--no-ff", "origin/main"],
+            cwd=workspace_path,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode == 0:
+            subprocess.run(["git", "merge", "--abort"], cwd=workspace_path, capture_output=True)
+            return []
+        
+        # Get list of conflicted files
+        conflict_result = subprocess.run(
+            ["git", "diff", "--name-only", "--diff-filter=U"],
+            cwd=workspace_path,
+            capture_output=True,
+            text=True
+        )
+        
+        # Abort the merge
+        subprocess.run(
+            ["git", "merge", "--abort"],
+            cwd=workspace_path,
+            capture_output=True
+        )
+        return conflict_result.stdout.strip().split('\n')
+    
     def integrate(self, 
                  ticket_id: str,
                  job_id: str,
@@ -324,14 +565,8 @@ class Integrator:
     
     def _register_component_dependencies(self, intents: List[Dict], ticket_id: str):
         """Register component-level dependencies."""
-        components = set()
-        
-        # Collect all components
-        for intent in intents:
-            if intent.get('component'):
-                components.add(intent['component'])
-        
-        # Register dependencies between components
+        # Collect each dependency between components once, in order
+        edges = {}
         for intent in intents:
             source_component = intent.get('component')
             if not source_component:
@@ -339,14 +574,17 @@ class Integrator:
             
             dependencies = intent.get('dependencies', [])
             for dep_path in dependencies:
-                target_component = self._infer_component(dep_path)
+                target_component = _infer_component(dep_path)
                 if target_component and target_component != source_component:
-                    self.registry.register_component_dependency(
-                        source_component, target_component, 'imports', ticket_id
-                    )
+                    edges[(source_component, target_component, 'imports', ticket_id)] = None
+        
+        if edges:
+            self.registry.register_component_dependencies(list(edges))
     
     def _update_knowledge_manager(self, intents: List[Dict], ticket_id: str):
         """Update Knowledge Manager with component APIs and decisions."""
+        components = []
+        api_infos = []
         for intent in intents:
             if intent['operation'] in ['create', 'update']:
                 component = intent.get('component')
@@ -357,7 +595,18 @@ class Integrator:
                                  intent['path'].endswith(('.tsx', '.jsx'))):
                     api_info = self._extract_api_info(content, intent['path'])
                     if api_info:
-                        self._register_api_with_km(component, api_info, ticket_id)
+                        components.append(component)
+                        api_infos.append(api_info)
+        
+        # The registrations are independent, so send them concurrently
+        if len(components) > 1:
+            if self._km_pool is None:
+                self._km_pool = ThreadPoolExecutor(max_workers=KM_WORKERS)
+            list(self._km_pool.map(
+                self._register_api_with_km, components, api_infos, [ticket_id] * len(components)
+            ))
+        elif components:
+            self._register_api_with_km(components[0], api_infos[0], ticket_id)
     
     def _extract_api_info(self, content: str, filepath: str) -> Dict:
         """Extract API information from component content."""
@@ -369,17 +618,9 @@ class Integrator:
         }
         
         # Simple regex-based extraction (could be enhanced with AST parsing)
-        import re
-        
         # Find exported functions/classes
-        export_patterns = [
-            r'export\s+(?:default\s+)?(?:function|class)\s+(\w+)',
-            r'export\s+const\s+(\w+)\s*=',
-            r'export\s*{\s*([^}]+)\s*}'
-        ]
-        
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
+        for pattern in _EXPORT_PATTERNS:
+            matches = pattern.findall(content)
             for match in matches:
                 if isinstance(match, str):
                     api_info["exports"].append(match.strip())
@@ -389,8 +630,7 @@ class Integrator:
                     api_info["exports"].extend(exports)
         
         # Find interface/type definitions
-        interface_pattern = r'interface\s+(\w+)\s*{([^}]+)}'
-        interfaces = re.findall(interface_pattern, content, re.MULTILINE | re.DOTALL)
+        interfaces = _find_interfaces(content)
         
         for interface_name, interface_body in interfaces:
             api_info["props"][interface_name] = interface_body.strip()
@@ -400,43 +640,45 @@ class Integrator:
     def _register_api_with_km(self, component: str, api_info: Dict, ticket_id: str):
         """Register API information with Knowledge Manager."""
         try:
-            requests.post(self.km_url, json={
+            self._http.post(self.km_url, json={
                 'tool_name': 'register_api',
                 'tool_input': {
                     'component_name': component,
                     'api_definition': api_info,
                     'ticket_id': ticket_id
                 }
-            }, timeout=5)
-        except:
+            }, timeout=KM_TIMEOUT)
+        except requests.RequestException:
             # KM might not be available, continue silently
             pass
     
     def _create_commit(self, files: List[str], ticket_id: str, job_id: str, target: Path) -> str:
         """Create git commit for integrated changes."""
         try:
-            # Check if we're in a git repository
-            subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
+            # Stage changes in one call
+            result = subprocess.run(
+                ["git", "add", "--"] + files,
                 cwd=target,
-                capture_output=True,
-                check=True
+                capture_output=True
             )
             
-            # Stage changes
-            for filepath in files:
-                subprocess.run(
-                    ["git", "add", filepath],
-                    cwd=target,
-                    capture_output=True
-                )
+            if result.returncode != 0:
+                # One unmatched path rejects the whole batch, so stage the
+                # files individually and let only the bad ones fail
+                for filepath in files:
+                    subprocess.run(
+                        ["git", "add", filepath],
+                        cwd=target,
+                        capture_output=True
+                    )
             
             # Commit
-            commit_message = f"Integrate {ticket_id}: {len(files)} files\n\nJob: {job_id}\nFiles:\n" + \
-                           "\n".join(f"- {f}" for f in files[:10])  # Limit to first 10 files
+            lines = [f"Integrate {ticket_id}: {len(files)} files", "", f"Job: {job_id}", "Files:"]
+            lines.extend(["- " + f for f in files[:10]])  # Limit to first 10 files
             
             if len(files) > 10:
-                commit_message += f"\n... and {len(files) - 10} more files"
+                lines.append(f"... and {len(files) - 10} more files")
+            commit_message = "\n".join(lines)
             
             result = subprocess.run(
                 ["git", "commit", "-m", commit_message],
@@ -1,16 +1,45 @@
 #!/usr/bin/env python3
 import json
+import re
 import sqlite3
 import hashlib
 import numpy as np
 import time
 import os
+import threading
 from flask import Flask, request, jsonify
 from pathlib import Path
 from typing import Dict, List, Optional
 
 app = Flask(__name__)
 
+# Grow the memory-mapped embedding matrix in 1MB steps
+EMBEDDING_GROW_BYTES = 1 << 20
+
+# FTS queries rescore this many BM25 candidates per requested result
+FTS_CANDIDATE_FACTOR = 10
+
+# Optional JIT-compiled ranking kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True)
+    def _rank(matrix, query, out):
+        """Fill out with the dot product of each matrix row and the query."""
+        for i in prange(matrix.shape[0]):
+            score = 0.0
+            for d in range(matrix.shape[1]):
+                score += matrix[i, d] * query[d]
+            out[i] = score
+else:
+    def _rank(matrix, query, out):
+        """Fill out with the dot product of each matrix row and the query."""
+        np.dot(matrix, query, out=out)
+
 # Import observability components
 try:
     from metrics_collector import get_metrics
@@ -27,6 +56,17 @@ class KnowledgeManager:
         self.conn.row_factory = sqlite3.Row
         self._initialize_db()
         
+        # Normalized fp16 embedding matrix, memory-mapped for queries
+        self.embeddings_path = self.db_path.with_suffix('.embeddings.f16')
+        self.embeddings_index_path = self.db_path.with_suffix('.embeddings.idx')
+        self._embedding_dim = None
+        self._embedding_ids = None
+        self._embedding_matrix = None
+        # fp32 rows backing _embedding_matrix, with spare capacity for appends
+        self._embedding_buffer = None
+        # The server is threaded; guards the index, file and matrix above
+        self._embedding_lock = threading.Lock()
+        
         # Simple embedding fallback if sentence-transformers not available
         try:
             from sentence_transformers import SentenceTransformer
@@ -73,6 +113,51 @@ class KnowledgeManager:
             );
         """)
         self.conn.commit()
+        self._initialize_fts()
+    
+    def _initialize_fts(self):
+        """Create the FTS5 index used by keyword search, if SQLite supports it."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master WHERE name = 'knowledge_fts'
+        """)
+        exists = cursor.fetchone() is not None
+        
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+                    content, title,
+                    content='knowledge_items', content_rowid='item_id'
+                );
+                
+                CREATE TRIGGER IF NOT EXISTS knowledge_fts_insert
+                AFTER INSERT ON knowledge_items BEGIN
+                    INSERT INTO knowledge_fts(rowid, content, title)
+                    VALUES (new.item_id, new.content, new.title);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS knowledge_fts_delete
+                AFTER DELETE ON knowledge_items BEGIN
+                    INSERT INTO knowledge_fts(knowledge_fts, rowid, content, title)
+                    VALUES ('delete', old.item_id, old.content, old.title);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS knowledge_fts_update
+                AFTER UPDATE ON knowledge_items BEGIN
+                    INSERT INTO knowledge_fts(knowledge_fts, rowid, content, title)
+                    VALUES ('delete', old.item_id, old.content, old.title);
+                    INSERT INTO knowledge_fts(rowid, content, title)
+                    VALUES (new.item_id, new.content, new.title);
+                END;
+            """)
+            if not exists:
+                # Index rows saved before the FTS table existed
+                self.conn.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+            self.conn.commit()
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5
+            self.has_fts = False
     
     def save_knowledge(self, 
                       ticket_id: str,
@@ -99,23 +184,149 @@ class KnowledgeManager:
             embedding = self.model.encode(content)
             embedding_blob = embedding.tobytes()
         
-        # Insert new item
-        cursor.execute("""
-            INSERT INTO knowledge_items 
-            (ticket_id, item_type, title, content, content_hash, embedding)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (ticket_id, item_type, title, content, content_hash, embedding_blob))
+        # Insert and append in one critical section, so a concurrent rebuild
+        # from the database cannot pick the new row up a second time
+        with self._embedding_lock:
+            cursor.execute("""
+                INSERT INTO knowledge_items 
+                (ticket_id, item_type, title, content, content_hash, embedding)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (ticket_id, item_type, title, content, content_hash, embedding_blob))
+            
+            self.conn.commit()
+            
+            if embedding_blob is not None:
+                self._append_embedding(cursor.lastrowid, embedding)
         
-        self.conn.commit()
         return cursor.lastrowid
     
+    def _normalize(self, embedding: np.ndarray) -> np.ndarray:
+        """Scale embeddings to unit length so a dot product is cosine similarity."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(embedding, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embedding / norms
+    
+    def _grow_embedding_file(self, size: int):
+        """Extend the embedding file to hold at least size bytes."""
+        current = self.embeddings_path.stat().st_size if self.embeddings_path.exists() else 0
+        if current >= size:
+            return
+        chunks = -(-size // EMBEDDING_GROW_BYTES)
+        with open(self.embeddings_path, 'ab') as f:
+            f.truncate(chunks * EMBEDDING_GROW_BYTES)
+    
+    def _sync_embedding_store(self):
+        """Load the embedding index, rebuilding it from the database if stale."""
+        if self._embedding_ids is not None:
+            return
+        
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) AS count, MAX(LENGTH(embedding)) AS width
+            FROM knowledge_items WHERE embedding IS NOT NULL
+        """)
+        row = cursor.fetchone()
+        count = row['count']
+        self._embedding_dim = row['width'] // 4 if row['width'] else None
+        
+        if self.embeddings_index_path.exists() and self.embeddings_path.exists():
+            ids = np.fromfile(self.embeddings_index_path, dtype=np.int64)
+            size = self.embeddings_path.stat().st_size
+            if len(ids) == count and (not count or size >= count * self._embedding_dim * 2):
+                self._embedding_ids = ids.tolist()
+                return
+        
+        # Rebuild the matrix from the stored BLOBs
+        cursor.execute("""
+            SELECT item_id, embedding FROM knowledge_items
+            WHERE embedding IS NOT NULL ORDER BY item_id
+        """)
+        rows = cursor.fetchall()
+        self.embeddings_path.unlink(missing_ok=True)
+        ids = np.array([r['item_id'] for r in rows], dtype=np.int64)
+        if rows:
+            matrix = np.stack([np.frombuffer(r['embedding'], dtype=np.float32) for r in rows])
+            data = self._normalize(matrix).astype(np.float16).tobytes()
+            self._grow_embedding_file(len(data))
+            with open(self.embeddings_path, 'r+b') as f:
+                f.write(data)
+        ids.tofile(self.embeddings_index_path)
+        self._embedding_ids = ids.tolist()
+        self._embedding_matrix = None
+    
+    def _append_embedding(self, item_id: int, embedding: np.ndarray):
+        """Append a new item's embedding to the memory-mapped matrix; call with _embedding_lock held."""
+        if self._embedding_ids is None:
+            # Not loaded yet; the first query rebuilds from the database
+            return
+        
+        row = self._normalize(embedding).astype(np.float16)
+        if self._embedding_dim is None:
+            self._embedding_dim = row.shape[-1]
+        
+        offset = len(self._embedding_ids) * self._embedding_dim * 2
+        self._grow_embedding_file(offset + row.nbytes)
+        with open(self.embeddings_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(row.tobytes())
+        with open(self.embeddings_index_path, 'ab') as f:
+            f.write(np.int64(item_id).tobytes())
+        
+        self._embedding_ids.append(item_id)
+        
+        # Grow the loaded matrix instead of reloading the whole file
+        matrix = self._embedding_matrix
+        if matrix is not None:
+            count = len(matrix)
+            buffer = self._embedding_buffer
+            if count == len(buffer):
+                # Double the capacity; readers keep views of the old buffer
+                buffer = np.empty((2 * count, self._embedding_dim), dtype=np.float32)
+                buffer[:count] = matrix
+                self._embedding_buffer = buffer
+            buffer[count] = row
+            self._embedding_matrix = buffer[:count + 1]
+    
+    def _get_embedding_matrix(self) -> Optional[np.ndarray]:
+        """
+        Return the contiguous (N, D) fp32 embedding matrix, loading it on first use.
+        
+        Call with _embedding_lock held. Appends only write rows past the end of
+        the returned matrix, or move to a new buffer, so it can be read after
+        releasing the lock.
+        """
+        self._sync_embedding_store()
+        if not self._embedding_ids:
+            return None
+        if self._embedding_matrix is None:
+            mapped = np.memmap(
+                self.embeddings_path, dtype=np.float16, mode='r',
+                shape=(len(self._embedding_ids), self._embedding_dim)
+            )
+            self._embedding_buffer = np.ascontiguousarray(mapped, dtype=np.float32)
+            self._embedding_matrix = self._embedding_buffer
+        return self._embedding_matrix
+    
     def query_knowledge(self, 
                        query: str,
                        ticket_id: Optional[str] = None,
                        limit: int = 5) -> List[Dict]:
         """Semantic search for relevant knowledge."""
+        if not self.has_embeddings and self.has_fts:
+            return self._query_fts(query, ticket_id, limit)
+        
+        query_words = frozenset(query.lower().split())
+        if not query_words and not self.has_embeddings:
+            # No keywords to match against
+            return []
+        
         cursor = self.conn.cursor()
-        sql = "SELECT * FROM knowledge_items"
+        sql = """
+            SELECT item_id, ticket_id, item_type, title, content,
+                   embedding IS NOT NULL AS has_embedding
+            FROM knowledge_items
+        """
         params = []
         
         if ticket_id:
@@ -128,20 +339,26 @@ class KnowledgeManager:
         
         if self.has_embeddings:
             # Semantic search with embeddings
-            query_embedding = self.model.encode(query)
+            query_embedding = self._normalize(self.model.encode(query))
+            
+            # Score every stored embedding in one pass over the mapped matrix
+            scores = {}
+            with self._embedding_lock:
+                matrix = self._get_embedding_matrix()
+                ids = self._embedding_ids[:len(matrix)] if matrix is not None else None
+            if matrix is not None:
+                # Per-query output, since concurrent requests rank at once
+                out = np.empty(len(ids), dtype=np.float32)
+                _rank(matrix, query_embedding, out)
+                scores = dict(zip(ids, out.tolist()))
             
             for row in cursor.fetchall():
-                if row['embedding']:
-                    # Reconstruct embedding from blob
-                    item_embedding = np.frombuffer(row['embedding'], dtype=np.float32)
-                    
-                    # Cosine similarity
-                    similarity = np.dot(query_embedding, item_embedding) / (
-                        np.linalg.norm(query_embedding) * np.linalg.norm(item_embedding)
-                    )
+                if row['has_embedding'] and row['item_id'] in scores:
+                    # Cosine similarity of normalized embeddings
+                    similarity = scores[row['item_id']]
                 else:
                     # Fallback to keyword match
-                    similarity = self._keyword_similarity(query, row['content'])
+                    similarity = self._keyword_similarity(query_words, row['content'])
                 
                 results.append({
                     "item_id": row['item_id'],
@@ -154,7 +371,7 @@ class KnowledgeManager:
         else:
             # Keyword-based search fallback
             for row in cursor.fetchall():
-                similarity = self._keyword_similarity(query, row['content'])
+                similarity = self._keyword_similarity(query_words, row['content'])
                 
                 results.append({
                     "item_id": row['item_id'],
@@ -169,15 +386,64 @@ class KnowledgeManager:
         results.sort(key=lambda x: x['similarity'], reverse=True)
         return results[:limit]
     
-    def _keyword_similarity(self, query: str, content: str) -> float:
-        """Simple keyword-based similarity."""
-        query_words = set(query.lower().split())
-        content_words = set(content.lower().split())
+    def _query_fts(self,
+                   query: str,
+                   ticket_id: Optional[str] = None,
+                   limit: int = 5) -> List[Dict]:
+        """
+        Keyword search over the FTS5 index.
+        
+        Only items containing at least one query term are returned. The best
+        BM25 matches are fetched as candidates; like the keyword fallback,
+        "similarity" is the fraction of query terms found in the item (0-1),
+        and BM25 breaks ties between equally matching items.
+        """
+        terms = frozenset(re.findall(r"\w+", query.lower()))
+        if not terms:
+            return []
+        
+        sql = """
+            SELECT k.item_id, k.ticket_id, k.item_type, k.title, k.content,
+                   bm25(knowledge_fts) AS score
+            FROM knowledge_fts
+            JOIN knowledge_items k ON k.item_id = knowledge_fts.rowid
+            WHERE knowledge_fts MATCH ?
+        """
+        params = [" OR ".join(f'"{term}"' for term in terms)]
+        
+        if ticket_id:
+            sql += " AND k.ticket_id = ?"
+            params.append(ticket_id)
         
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit * FTS_CANDIDATE_FACTOR)
+        
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        
+        scored = []
+        for row in cursor.fetchall():
+            text = f"{row['title']} {row['content']}".lower()
+            matched = terms.intersection(re.findall(r"\w+", text))
+            # bm25() is lower-is-better
+            scored.append((-len(matched) / len(terms), row['score'], row))
+        scored.sort(key=lambda item: item[:2])
+        
+        return [{
+            "item_id": row['item_id'],
+            "ticket_id": row['ticket_id'],
+            "type": row['item_type'],
+            "title": row['title'],
+            "content": row['content'],
+            "similarity": -similarity
+        } for similarity, _, row in scored[:limit]]
+    
+    def _keyword_similarity(self, query_words: frozenset, content: str) -> float:
+        """Simple keyword-based similarity against pre-split query words."""
         if not query_words:
             return 0.0
         
-        intersection = query_words.intersection(content_words)
+        intersection = query_words.intersection(content.lower().split())
         return len(intersection) / len(query_words)
     
     def get_file_path(self, component_name: str, file_type: str) -> str:
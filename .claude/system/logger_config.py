@@ -120,6 +120,9 @@ class ContextualLogger:
     
     def _log_with_context(self, level: int, msg: Any, *args, **kwargs):
         """Log message with persistent context."""
+        if not self.logger.isEnabledFor(level):
+            return
+        
         extra = kwargs.get('extra', {})
         extra.update({k: v for k, v in self.context.items() if v is not None})
         kwargs['extra'] = extra
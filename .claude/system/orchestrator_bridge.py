@@ -14,11 +14,50 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+# Parses trigger files and event lines straight from bytes
+_load_json = orjson.loads if ORJSON_AVAILABLE else json.loads
+
 # Import both systems we're bridging
 from parallel_executor import ParallelExecutor, TaskPriority
 from operational_orchestrator import OperationalOrchestrator
 from agent_dependency_graph import AgentDependencyGraph
 
+# Executor priority per agent; agents not listed run at NORMAL
+_AGENT_PRIORITIES = {
+    'contract-guardian': TaskPriority.CRITICAL,
+    'security-agent': TaskPriority.CRITICAL,
+    'incident-response-agent': TaskPriority.CRITICAL,
+    'test-executor': TaskPriority.HIGH,
+    'data-migration-agent': TaskPriority.HIGH,
+    'developer-agent': TaskPriority.NORMAL,
+    'architect-agent': TaskPriority.NORMAL,
+    'documentation-agent': TaskPriority.LOW,
+    'performance-optimizer-agent': TaskPriority.LOW,
+}
+
+# Longest wait between monitor passes. With inotify the wait ends as soon
+# as the event log or the triggers directory changes
+MONITOR_POLL_SECONDS = 1
+
+# Agents run for event types that don't depend on the event data
+_EVENT_AGENTS = {
+    'DEPLOYMENT_INITIATED': ('monitoring-agent', 'security-agent', 'devops-agent'),
+    'ERROR_SPIKE_DETECTED': ('incident-response-agent',),
+    'REQUIREMENTS_UPDATED': ('product-agent', 'pm-agent', 'architect-agent'),
+}
+
 @dataclass
 class AgentTaskMapping:
     """Maps trigger types to parallel executor tasks"""
@@ -48,6 +87,13 @@ class OrchestratorBridge:
         # Track processed triggers to avoid duplicates
         self.processed_triggers = set()
         
+        # Event log handle kept open by monitor_events between polls
+        self._event_log_file = None
+        
+        # mtime of the triggers directory at the last scan that left
+        # nothing behind; an unchanged directory is not listed again
+        self._trigger_dir_mtime = None
+        
     def _setup_logging(self):
         """Setup bridge logger"""
         log_dir = self.claude_dir / "logs"
@@ -112,58 +158,48 @@ class OrchestratorBridge:
             files = event.get('data', {}).get('files_changed', [])
             
             # Always run for code changes
-            agents.extend(['test-executor', 'documentation-agent'])
+            agents.extend(('test-executor', 'documentation-agent'))
+            
+            # Conditional agents based on file types, classified in one
+            # pass that stops once every kind has been seen
+            has_py = has_api = has_migration = has_frontend = False
+            for f in files:
+                if not has_py and '.py' in f:
+                    has_py = True
+                if not has_api:
+                    lowered = f.lower()
+                    has_api = 'api' in lowered or 'schema' in lowered
+                if not has_migration and ('migration' in f or '.sql' in f):
+                    has_migration = True
+                if not has_frontend and (f.startswith('src/frontend') or '.tsx' in f or '.jsx' in f):
+                    has_frontend = True
+                if has_py and has_api and has_migration and has_frontend:
+                    break
             
-            # Conditional agents based on file types
-            if any('.py' in f for f in files):
+            if has_py:
                 agents.append('performance-optimizer-agent')
                 
-            if any('api' in f.lower() or 'schema' in f.lower() for f in files):
+            if has_api:
                 agents.append('contract-guardian')
                 
-            if any('migration' in f or '.sql' in f for f in files):
-                agents.extend(['database-agent', 'data-migration-agent'])
+            if has_migration:
+                agents.extend(('database-agent', 'data-migration-agent'))
                 
-            if any(f.startswith('src/frontend') or '.tsx' in f or '.jsx' in f for f in files):
-                agents.extend(['frontend-agent', 'ux-agent'])
+            if has_frontend:
+                agents.extend(('frontend-agent', 'ux-agent'))
                 
-        elif event_type == 'DEPLOYMENT_INITIATED':
-            agents.extend(['monitoring-agent', 'security-agent', 'devops-agent'])
-            
-        elif event_type == 'ERROR_SPIKE_DETECTED':
-            agents.append('incident-response-agent')
-            
-        elif event_type == 'REQUIREMENTS_UPDATED':
-            agents.extend(['product-agent', 'pm-agent', 'architect-agent'])
+        elif event_type in _EVENT_AGENTS:
+            agents.extend(_EVENT_AGENTS[event_type])
             
         # Remove duplicates while preserving order
-        seen = set()
-        unique_agents = []
-        for agent in agents:
-            if agent not in seen:
-                seen.add(agent)
-                unique_agents.append(agent)
-                
-        return unique_agents
+        return list(dict.fromkeys(agents))
         
     def _submit_agent_task(self, agent: str, event: Dict[str, Any],
                           dependencies: List[str] = None) -> Optional[str]:
         """Submit a single agent task to the parallel executor"""
         
         # Determine priority based on agent
-        priority_map = {
-            'contract-guardian': TaskPriority.CRITICAL,
-            'security-agent': TaskPriority.CRITICAL,
-            'incident-response-agent': TaskPriority.CRITICAL,
-            'test-executor': TaskPriority.HIGH,
-            'data-migration-agent': TaskPriority.HIGH,
-            'developer-agent': TaskPriority.NORMAL,
-            'architect-agent': TaskPriority.NORMAL,
-            'documentation-agent': TaskPriority.LOW,
-            'performance-optimizer-agent': TaskPriority.LOW,
-        }
-        
-        priority = priority_map.get(agent, TaskPriority.NORMAL)
+        priority = _AGENT_PRIORITIES.get(agent, TaskPriority.NORMAL)
         
         # Build task parameters
         params = {
@@ -197,17 +233,37 @@ class OrchestratorBridge:
         trigger_dir = self.claude_dir / "triggers"
         processed_count = 0
         
-        for trigger_file in trigger_dir.glob("*_trigger_*.json"):
+        try:
+            dir_mtime = os.stat(trigger_dir).st_mtime_ns
+        except OSError:
+            return
+        if dir_mtime == self._trigger_dir_mtime:
+            return
+        
+        failed = False
+        triggers = []
+        with os.scandir(trigger_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and '_trigger_' in entry.name[:-5]:
+                    try:
+                        triggers.append((entry.stat().st_mtime_ns, entry.name))
+                    except OSError:
+                        continue
+        
+        # Oldest first, so tasks are queued in the order they were triggered
+        triggers.sort()
+        
+        for _, name in triggers:
+            trigger_file = trigger_dir / name
             # Skip if already processed
-            if trigger_file.name in self.processed_triggers:
+            if name in self.processed_triggers:
                 continue
                 
             try:
-                with open(trigger_file, 'r') as f:
-                    trigger_data = json.load(f)
+                trigger_data = _load_json(trigger_file.read_bytes())
                     
                 # Extract agent from filename
-                agent = trigger_file.stem.split('_trigger_')[0]
+                agent = name[:-5].split('_trigger_')[0]
                 
                 # Submit as task
                 task_id = self.executor.submit_task(
@@ -217,18 +273,27 @@ class OrchestratorBridge:
                 )
                 
                 # Mark as processed
-                self.processed_triggers.add(trigger_file.name)
+                self.processed_triggers.add(name)
                 processed_count += 1
                 
                 # Optionally archive the trigger file
                 archive_dir = self.claude_dir / "triggers" / "archived"
                 archive_dir.mkdir(exist_ok=True)
-                trigger_file.rename(archive_dir / trigger_file.name)
+                trigger_file.rename(archive_dir / name)
                 
-                self.logger.info(f"Processed trigger file {trigger_file.name} → task {task_id}")
+                self.logger.info(f"Processed trigger file {name} → task {task_id}")
                 
             except Exception as e:
+                failed = True
                 self.logger.error(f"Failed to process trigger {trigger_file}: {e}")
+        
+        # Failed triggers are retried on the next call. Otherwise remember
+        # the mtime, unless it is too recent to rule out a file created
+        # later within the same timestamp tick
+        if not failed and time.time_ns() - dir_mtime > 1_000_000_000:
+            self._trigger_dir_mtime = dir_mtime
+        else:
+            self._trigger_dir_mtime = None
                 
         if processed_count > 0:
             self.logger.info(f"Processed {processed_count} trigger files into task queue")
@@ -239,43 +304,87 @@ class OrchestratorBridge:
         This replaces the multiple monitoring systems
         """
         event_log = self.claude_dir / "events" / "log.ndjson"
-        processed_position = 0
+        watcher = INotify() if INOTIFY_AVAILABLE else None
+        watches = {}
         
         self.logger.info("Starting event monitor...")
         
         while True:
             try:
-                # Check for new events
-                if event_log.exists():
-                    with open(event_log, 'r') as f:
-                        # Skip to last position
-                        f.seek(processed_position)
-                        
-                        for line in f:
-                            if line.strip():
-                                try:
-                                    event = json.loads(line)
-                                    # Process event and submit tasks
-                                    self.process_event(event)
-                                except json.JSONDecodeError:
-                                    self.logger.warning(f"Invalid JSON in event log: {line}")
-                                    
-                        # Update position
-                        processed_position = f.tell()
+                # Read whatever was appended since the last poll
+                event_file = self._follow_event_log(event_log)
+                if event_file is not None:
+                    for line in event_file:
+                        if line.strip():
+                            try:
+                                event = _load_json(line)
+                                # Process event and submit tasks
+                                self.process_event(event)
+                            except json.JSONDecodeError:
+                                self.logger.warning(f"Invalid JSON in event log: {line.decode('utf-8', 'replace')}")
                         
                 # Also process any legacy trigger files
                 self.process_trigger_files()
                 
-                # Sleep before next check
-                time.sleep(1)
+                # Wait for changes before next check
+                self._wait_for_changes(watcher, watches)
                 
             except KeyboardInterrupt:
                 self.logger.info("Event monitor stopped by user")
+                if self._event_log_file is not None:
+                    self._event_log_file.close()
+                    self._event_log_file = None
+                if watcher is not None:
+                    watcher.close()
                 break
             except Exception as e:
                 self.logger.error(f"Event monitor error: {e}")
                 time.sleep(5)  # Wait longer on error
 
+    def _wait_for_changes(self, watcher, watches: Dict[Path, int]):
+        """Wait up to MONITOR_POLL_SECONDS, returning early on inotify events"""
+        if watcher is None:
+            time.sleep(MONITOR_POLL_SECONDS)
+            return
+        
+        # Directories are watched once they exist; appends, new files and
+        # renames into them wake the monitor
+        for directory in (self.claude_dir / "events", self.claude_dir / "triggers"):
+            if directory not in watches:
+                try:
+                    watches[directory] = watcher.add_watch(
+                        str(directory),
+                        inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO
+                    )
+                except OSError:
+                    pass
+        
+        for event in watcher.read(timeout=MONITOR_POLL_SECONDS * 1000):
+            if event.mask & inotify_flags.IGNORED:
+                # The directory was removed; watch it again once it is back
+                for directory, wd in list(watches.items()):
+                    if wd == event.wd:
+                        del watches[directory]
+    
+    def _follow_event_log(self, event_log: Path):
+        """Return the open event log, reopening it after rotation or truncation"""
+        try:
+            stat = os.stat(event_log)
+        except OSError:
+            stat = None
+        
+        current = self._event_log_file
+        if current is not None:
+            if (stat is not None and os.fstat(current.fileno()).st_ino == stat.st_ino
+                    and stat.st_size >= current.tell()):
+                return current
+            current.close()
+            self._event_log_file = None
+        
+        if stat is not None:
+            self._event_log_file = open(event_log, 'rb')
+        return self._event_log_file
+
 
 def main():
     """CLI interface for the orchestrator bridge"""
@@ -9,7 +9,7 @@ import psutil
 import os
 import signal
 from pathlib import Path
-from typing import Dict, List, Set, Generator, Optional
+from typing import Dict, Set, Generator, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from orchestrator import TaskOrchestrator
 from file_registry import FileRegistry
@@ -272,67 +272,33 @@ class ParallelOrchestrator(TaskOrchestrator):
     
     def acquire_file_locks(self, ticket_id: str, files: Set[str]) -> bool:
         """
-        Phase 1 Enhanced Locking: Use only registry-backed locking with cleanup.
+        Phase 1 Enhanced Locking: Use only registry-backed locking, all or nothing.
         Try to acquire locks on all files for a ticket with proper error handling.
         """
-        acquired_locks = []
-        
         try:
-            # Phase 1 Enhancement: Use only registry locking, no in-memory tracking
-            for file_path in files:
-                success = self.registry.acquire_lock(file_path, ticket_id)
-                if success:
-                    acquired_locks.append(file_path)
-                    self.logger.debug("Lock acquired", extra={
-                        'file_path': file_path,
-                        'ticket_id': ticket_id
-                    })
-                else:
-                    # Failed to acquire lock - cleanup and return False
-                    self.logger.warning("Failed to acquire lock", extra={
-                        'file_path': file_path,
-                        'ticket_id': ticket_id,
-                        'acquired_so_far': len(acquired_locks)
-                    })
-                    
-                    # Phase 1 Enhancement: Cleanup on partial failure
-                    self._cleanup_partial_locks(acquired_locks, ticket_id)
-                    return False
+            # All-or-nothing in one registry transaction, so a conflict or
+            # error leaves no partial locks behind to clean up
+            if not self.registry.acquire_locks(files, ticket_id):
+                self.logger.warning("Failed to acquire lock", extra={
+                    'ticket_id': ticket_id,
+                    'file_count': len(files)
+                })
+                return False
             
             self.logger.info("All file locks acquired", extra={
                 'ticket_id': ticket_id,
-                'file_count': len(acquired_locks)
+                'file_count': len(files)
             })
             return True
             
         except Exception as e:
-            # Phase 1 Enhancement: Robust error handling with cleanup
+            # Phase 1 Enhancement: Robust error handling
             self.logger.error("Exception during lock acquisition", extra={
                 'ticket_id': ticket_id,
-                'error': str(e),
-                'acquired_so_far': len(acquired_locks)
+                'error': str(e)
             })
-            
-            # Cleanup any locks we managed to acquire
-            self._cleanup_partial_locks(acquired_locks, ticket_id)
             return False
     
-    def _cleanup_partial_locks(self, acquired_locks: List[str], ticket_id: str):
-        """Phase 1 Enhancement: Clean up partially acquired locks."""
-        for file_path in acquired_locks:
-            try:
-                self.registry.release_lock(file_path, ticket_id)
-                self.logger.debug("Lock released during cleanup", extra={
-                    'file_path': file_path,
-                    'ticket_id': ticket_id
-                })
-            except Exception as cleanup_error:
-                self.logger.error("Failed to release lock during cleanup", extra={
-                    'file_path': file_path,
-                    'ticket_id': ticket_id,
-                    'cleanup_error': str(cleanup_error)
-                })
-    
     def release_file_locks(self, ticket_id: str):
         """
         Phase 1 Enhanced: Release all file locks held by a ticket using registry.
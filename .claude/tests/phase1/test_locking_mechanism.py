@@ -2,6 +2,9 @@
 """
 Phase 1 Locking Tests: Lock Acquisition and Cleanup
 Tests the enhanced locking mechanism in parallel_orchestrator.py
+
+Every test builds its own orchestrator and registry, so the suite can be
+spread across cores with pytest-xdist: pytest -n auto test_locking_mechanism.py
 """
 
 import unittest
@@ -14,11 +17,54 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Add system path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "system"))
+SYSTEM_DIR = Path(__file__).parent.parent.parent / "system"
+sys.path.insert(0, str(SYSTEM_DIR))
 
 from parallel_orchestrator import ParallelOrchestrator
 from file_registry import FileRegistry
 
+# WAL lets readers run alongside the writer, and NORMAL sync drops the
+# per-commit fsync of the rollback journal; durability across power loss
+# doesn't matter for a throwaway test database
+REGISTRY_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+)
+
+
+# Verification queries, kept as constants so each test reuses the
+# connection's cached prepared statement instead of a fresh SQL string
+_SQL_LOCKED_COUNT = """
+    SELECT COUNT(*) as count FROM files 
+    WHERE lock_owner = ? AND lock_status = 'locked'
+"""
+_SQL_PATH_LOCK = """
+    SELECT lock_owner, lock_status FROM files 
+    WHERE path = ? AND lock_status = 'locked'
+"""
+_SQL_LOCKED_PAIR = """
+    SELECT path FROM files 
+    WHERE path IN (?, ?) AND lock_status = 'locked'
+"""
+
+# Set TEST_INMEM=0 to run the locking tests against an on-disk database
+TEST_INMEM = os.environ.get("TEST_INMEM", "1") == "1"
+
+
+def make_test_registry(db_path: str, uri: bool = False) -> FileRegistry:
+    """Create a FileRegistry with its schema and test-tuned pragmas."""
+    registry = FileRegistry(db_path=db_path, uri=uri)
+    for pragma in REGISTRY_PRAGMAS:
+        registry.conn.execute(pragma)
+    
+    # FileRegistry looks for schema.sql relative to the working directory,
+    # which setUp has moved into the temp dir
+    registry.conn.executescript((SYSTEM_DIR / "schema.sql").read_text())
+    return registry
+
 
 class TestLockingMechanism(unittest.TestCase):
     """Test enhanced locking mechanism with cleanup from Phase 1."""
@@ -38,8 +84,14 @@ class TestLockingMechanism(unittest.TestCase):
         with patch('parallel_orchestrator.TaskOrchestrator.__init__', return_value=None):
             self.orchestrator = ParallelOrchestrator(max_workers=2)
             
-        # Set up registry manually
-        self.orchestrator.registry = FileRegistry(db_path=f"{self.temp_dir}/.claude/registry/test.db")
+        # Set up registry manually; the in-memory database lives until
+        # tearDown closes its only connection
+        if TEST_INMEM:
+            self.orchestrator.registry = make_test_registry(
+                "file:lockreg_%d?mode=memory&cache=shared" % id(self), uri=True)
+        else:
+            self.orchestrator.registry = make_test_registry(
+                f"{self.temp_dir}/.claude/registry/test.db")
         
     def tearDown(self):
         """Clean up test environment."""
@@ -61,10 +113,7 @@ class TestLockingMechanism(unittest.TestCase):
         # Verify locks are recorded in registry
         for file_path in files:
             cursor = self.orchestrator.registry.conn.cursor()
-            cursor.execute("""
-                SELECT lock_owner, lock_status FROM files 
-                WHERE path = ? AND lock_status = 'locked'
-            """, (file_path,))
+            cursor.execute(_SQL_PATH_LOCK, (file_path,))
             row = cursor.fetchone()
             self.assertIsNotNone(row, f"Lock should be recorded for {file_path}")
             self.assertEqual(row['lock_owner'], ticket_id)
@@ -100,21 +149,14 @@ class TestLockingMechanism(unittest.TestCase):
         
         # Verify that no locks were left for ticket2 (cleanup occurred)
         cursor = self.orchestrator.registry.conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM files 
-            WHERE lock_owner = ? AND lock_status = 'locked'
-        """, (ticket2,))
+        cursor.execute(_SQL_LOCKED_COUNT, (ticket2,))
         count = cursor.fetchone()['count']
         self.assertEqual(count, 0, "Failed ticket should have no remaining locks")
         
         # Verify file2.py and file3.py are not locked by anyone
-        for file_path in ["src/file2.py", "src/file3.py"]:
-            cursor.execute("""
-                SELECT lock_status FROM files 
-                WHERE path = ? AND lock_status = 'locked'
-            """, (file_path,))
-            row = cursor.fetchone()
-            self.assertIsNone(row, f"{file_path} should not be locked after cleanup")
+        cursor.execute(_SQL_LOCKED_PAIR, ("src/file2.py", "src/file3.py"))
+        locked = [row['path'] for row in cursor.fetchall()]
+        self.assertEqual(locked, [], f"{locked} should not be locked after cleanup")
     
     def test_lock_release(self):
         """Test proper release of all locks for a ticket."""
@@ -130,29 +172,59 @@ class TestLockingMechanism(unittest.TestCase):
         
         # Verify all locks are released
         cursor = self.orchestrator.registry.conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM files 
-            WHERE lock_owner = ? AND lock_status = 'locked'
-        """, (ticket_id,))
+        cursor.execute(_SQL_LOCKED_COUNT, (ticket_id,))
         count = cursor.fetchone()['count']
         self.assertEqual(count, 0, "All locks should be released")
     
+    def test_many_file_lock_acquisition(self):
+        """Test all-or-nothing locking beyond SQLite's host parameter limit."""
+        registry = self.orchestrator.registry
+        files = [f"src/many/file{i}.py" for i in range(2500)]
+        
+        self.assertTrue(registry.acquire_locks(files, "TEST-LOCK-004A"))
+        
+        # A conflict in the last chunk still refuses the whole set
+        others = [f"src/other/file{i}.py" for i in range(1500)]
+        self.assertFalse(registry.acquire_locks(others + [files[-1]], "TEST-LOCK-004B"))
+        cursor = registry.conn.cursor()
+        cursor.execute(_SQL_LOCKED_COUNT, ("TEST-LOCK-004B",))
+        self.assertEqual(cursor.fetchone()['count'], 0)
+    
+    def test_lock_acquisition_refuses_open_transaction(self):
+        """Test that acquire_locks does not commit a caller's transaction."""
+        registry = self.orchestrator.registry
+        registry.conn.execute("""
+            INSERT INTO files (path, canonical_path, content_hash, ticket_id,
+                               job_id, agent_name, last_event_id)
+            VALUES ('src/pending.py', 'src/pending.py', '', 'T', '', '', '')
+        """)
+        
+        with self.assertRaises(RuntimeError):
+            registry.acquire_locks(["src/locked.py"], "TEST-LOCK-004C")
+        
+        # The caller's pending insert is still theirs to commit or roll back
+        self.assertTrue(registry.conn.in_transaction)
+        registry.conn.rollback()
+    
     def test_concurrent_lock_acquisition(self):
         """Test concurrent lock acquisition by multiple threads."""
         files = {"src/concurrent_test.py"}
         results = {}
+        num_threads = 5
+        barrier = threading.Barrier(num_threads)
         
         def acquire_lock_thread(ticket_id):
             """Thread function to acquire locks."""
+            barrier.wait(timeout=2)  # Race every thread for the lock at once
             success = self.orchestrator.acquire_file_locks(ticket_id, files)
             results[ticket_id] = success
+            barrier.wait(timeout=2)  # Hold the lock until every thread has tried
             if success:
-                time.sleep(0.1)  # Hold lock briefly
                 self.orchestrator.release_file_locks(ticket_id)
         
         # Start multiple threads trying to acquire same lock
         threads = []
-        for i in range(5):
+        for i in range(num_threads):
             ticket_id = f"CONCURRENT-{i}"
             thread = threading.Thread(target=acquire_lock_thread, args=(ticket_id,))
             threads.append(thread)
@@ -172,28 +244,19 @@ class TestLockingMechanism(unittest.TestCase):
         ticket_id = "TEST-LOCK-006"
         files = {"src/test1.py", "src/test2.py"}
         
-        # Mock the registry to raise exception on second file
-        original_acquire = self.orchestrator.registry.acquire_lock
-        call_count = 0
-        
-        def mock_acquire_lock(path, ticket):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return original_acquire(path, ticket)  # First call succeeds
-            else:
-                raise Exception("Simulated database error")  # Second call fails
+        # Make the database fail partway through the batch, on src/test2.py
+        self.orchestrator.registry.conn.execute("""
+            CREATE TEMP TRIGGER fail_second_lock BEFORE INSERT ON files
+            WHEN NEW.path = 'src/test2.py'
+            BEGIN SELECT RAISE(ABORT, 'Simulated database error'); END
+        """)
         
-        with patch.object(self.orchestrator.registry, 'acquire_lock', side_effect=mock_acquire_lock):
-            success = self.orchestrator.acquire_file_locks(ticket_id, files)
-            self.assertFalse(success, "Should fail due to exception")
+        success = self.orchestrator.acquire_file_locks(ticket_id, files)
+        self.assertFalse(success, "Should fail due to exception")
         
         # Verify cleanup occurred - no locks should remain
         cursor = self.orchestrator.registry.conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM files 
-            WHERE lock_owner = ? AND lock_status = 'locked'
-        """, (ticket_id,))
+        cursor.execute(_SQL_LOCKED_COUNT, (ticket_id,))
         count = cursor.fetchone()['count']
         self.assertEqual(count, 0, "No locks should remain after exception")
     
@@ -220,10 +283,7 @@ class TestLockingMechanism(unittest.TestCase):
         self.assertGreater(cleaned_count, 0, "Should clean up expired locks")
         
         # Verify lock is no longer active
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM files 
-            WHERE lock_owner = ? AND lock_status = 'locked'
-        """, (ticket_id,))
+        cursor.execute(_SQL_LOCKED_COUNT, (ticket_id,))
         count = cursor.fetchone()['count']
         self.assertEqual(count, 0, "Expired lock should be cleaned up")
     
@@ -252,6 +312,7 @@ class TestLockingMechanism(unittest.TestCase):
         num_threads = 4
         num_files = 3
         results = []
+        barrier = threading.Barrier(num_threads)
         
         def concurrent_operation(thread_id):
             """Simulate concurrent file operations."""
@@ -259,9 +320,9 @@ class TestLockingMechanism(unittest.TestCase):
             files = {f"src/file{i}.py" for i in range(num_files)}
             
             try:
-                # Try to acquire locks
+                # Try to acquire locks, all threads at once
+                barrier.wait(timeout=2)
                 if self.orchestrator.acquire_file_locks(ticket_id, files):
-                    time.sleep(0.1)  # Simulate work
                     self.orchestrator.release_file_locks(ticket_id)
                     results.append(f"SUCCESS-{thread_id}")
                 else:
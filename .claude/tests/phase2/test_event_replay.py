@@ -6,6 +6,7 @@ Tests enhanced event replay functionality with filtering and validation.
 
 import json
 import time
+import threading
 import shutil
 import hashlib
 from pathlib import Path
@@ -348,6 +349,26 @@ class TestEventReplay(unittest.TestCase):
         }
         self.assertTrue(self.event_logger._validate_event_checksum(no_payload_event))
 
+    
+    def test_build_event_ids_unique_across_threads(self):
+        """Test that threads sharing one logger never get the same event ID."""
+        ids = []
+        
+        def build():
+            ids.extend(
+                self.event_logger.build_event("TICKET-0", "TEST_EVENT", {})["event_id"]
+                for _ in range(2000)
+            )
+        
+        # Same millisecond for every event, so only the counter tells them apart
+        with patch('event_logger.time.time', return_value=1700000000.0):
+            threads = [threading.Thread(target=build) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(len(set(ids)), len(ids))
 
 def run_event_replay_tests():
     """Run all event replay tests."""
@@ -7,6 +7,7 @@ Tests the basic operation of the SimpleOrchestrator.
 import sys
 import os
 import json
+import itertools
 import tempfile
 import shutil
 from pathlib import Path
@@ -24,7 +25,7 @@ def test_simple_orchestrator_initialization():
     orchestrator = SimpleOrchestrator()
     
     assert orchestrator.simple_mode_active is True
-    assert orchestrator.task_history == []
+    assert len(orchestrator.task_history) == 0
     assert orchestrator.current_task is None
     print("✓ Simple orchestrator initializes correctly")
 
@@ -148,6 +149,25 @@ def test_generic_task_handling():
         print(f"✓ Generic task handling successful: {summary_file}")
 
 
+def test_complex_task_skipped():
+    """Test that clearly complex tasks are rejected before any file work."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        
+        orchestrator = SimpleOrchestrator()
+        result = orchestrator.process_task(
+            "refactor the database architecture for security and scalability"
+        )
+        
+        assert result["success"] is False
+        assert result["skipped"] is True
+        assert result["recommendation"] == "full"
+        assert not list(Path(".").glob("*.md")) and not list(Path(".").glob("*.txt"))
+        assert len(orchestrator.task_history) == 0
+        
+        print("✓ Complex task skipped without file operations")
+
+
 def test_validation_process():
     """Test the validation process."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -232,6 +252,25 @@ def test_status_reporting():
     print("✓ Status reporting working correctly")
 
 
+def test_status_running_totals():
+    """Test that status totals track completed tasks."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        
+        orchestrator = SimpleOrchestrator()
+        results = [
+            orchestrator.process_task("create first file"),
+            orchestrator.process_task("fix the second bug")
+        ]
+        
+        status = orchestrator.get_status()
+        assert status["tasks_completed"] == 2
+        assert status["total_operations"] == sum(r["operations"] for r in results)
+        assert status["average_duration"] > 0
+        
+        print("✓ Status running totals tracked correctly")
+
+
 def test_event_logging_integration():
     """Test integration with event logging."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -256,6 +295,57 @@ def test_event_logging_integration():
         print(f"✓ Event logging integration successful: {len(task_events)} events")
 
 
+def test_buffered_events_keep_their_own_timestamps():
+    """Test that buffered events are stamped when logged, not when flushed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        
+        orchestrator = SimpleOrchestrator()
+        with patch('event_logger.time') as mock_time:
+            mock_time.time.side_effect = itertools.count(1000)
+            orchestrator.process_task("test event timestamps")
+        
+        events = orchestrator.event_logger.replay_events()
+        started, completed = [e for e in events if e["type"].startswith("SIMPLE_TASK")]
+        assert started["type"] == "SIMPLE_TASK_STARTED"
+        assert started["timestamp"] < completed["timestamp"]
+        assert started["event_id"] != completed["event_id"]
+        
+        print("✓ Buffered events keep their own timestamps")
+
+
+def test_failed_action_cancels_unstarted_group():
+    """Test that actions queued behind a failure in a parallel group never run."""
+    import time
+    import simple_orchestrator
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        
+        orchestrator = SimpleOrchestrator()
+        started = []
+        
+        def execute(action, plan, ticket_id):
+            started.append(action)
+            if len(started) == 1:
+                return {"success": False, "error": "boom"}
+            time.sleep(0.2)
+            return {"success": True}
+        
+        plan = {"actions": ["create_file", "fix_issue", "generic_task", "create_file"]}
+        pool = ThreadPoolExecutor(max_workers=1)
+        with patch.object(simple_orchestrator, '_action_pool', pool), \
+                patch.object(orchestrator, '_execute_action', side_effect=execute):
+            result = orchestrator._implement_simple_plan(plan, "TEST-CANCEL")
+        pool.shutdown(wait=True)
+        
+        assert result["success"] is False
+        assert len(started) <= 2
+        
+        print("✓ Failed action cancels unstarted group members")
+
+
 def run_simple_mode_tests():
     """Run all simple mode tests."""
     print("=" * 60)
@@ -269,11 +359,15 @@ def run_simple_mode_tests():
         test_modify_file_action,
         test_fix_issue_action,
         test_generic_task_handling,
+        test_complex_task_skipped,
         test_validation_process,
         test_error_handling,
         test_task_history_tracking,
         test_status_reporting,
-        test_event_logging_integration
+        test_status_running_totals,
+        test_event_logging_integration,
+        test_buffered_events_keep_their_own_timestamps,
+        test_failed_action_cancels_unstarted_group
     ]
     
     passed = 0
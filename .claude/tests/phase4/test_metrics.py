@@ -6,6 +6,8 @@ Validates Prometheus compatibility and performance impact.
 import unittest
 import time
 import threading
+import gc
+import weakref
 import sys
 import os
 from pathlib import Path
@@ -16,6 +18,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'system'))
 from metrics_collector import MetricsCollector, get_metrics
 from metrics_collector import increment_task_counter, record_task_duration, set_active_tasks
 
+# Observations for the thread-safety workers, built once
+_OBSERVATIONS = [i * 0.01 for i in range(100)]
+
 class TestMetricsCollection(unittest.TestCase):
     """Test metrics collection functionality."""
     
@@ -35,6 +40,13 @@ class TestMetricsCollection(unittest.TestCase):
             'agent': 'test'
         })
         
+        # Test counter with a prebuilt label tuple
+        self.collector.increment_counter('task_counter', (
+            ('status', 'success'),
+            ('mode', 'simple'),
+            ('agent', 'test')
+        ))
+        
         # Test custom increment value
         self.collector.increment_counter('test_counter', value=5)
         
@@ -67,8 +79,7 @@ class TestMetricsCollection(unittest.TestCase):
         })
         
         # Test multiple observations
-        for i in range(10):
-            self.collector.record_histogram('response_time', i * 0.1)
+        self.collector.record_histogram_bulk('response_time', [i * 0.1 for i in range(10)])
         
         # Should not raise exceptions
         self.assertTrue(True)
@@ -141,20 +152,26 @@ class TestMetricsCollection(unittest.TestCase):
         """Test that metrics collection has minimal performance impact."""
         iterations = 1000
         
+        child = self.collector.labels('perf_test', ())
+        
         # Measure baseline (no metrics)
         self.collector.disable_metrics()
         start_time = time.time()
         for i in range(iterations):
-            self.collector.increment_counter('perf_test')
+            child.inc()
         baseline_time = time.time() - start_time
         
         # Measure with metrics enabled
         self.collector.enable_metrics()
         start_time = time.time()
         for i in range(iterations):
-            self.collector.increment_counter('perf_test')
+            child.inc()
         metrics_time = time.time() - start_time
         
+        # Record a few operations through the unbound API for overhead data
+        for i in range(10):
+            self.collector.increment_counter('perf_test')
+        
         # Get performance impact data
         impact = self.collector.get_performance_impact()
         
@@ -169,10 +186,14 @@ class TestMetricsCollection(unittest.TestCase):
     def test_thread_safety(self):
         """Test that metrics collection is thread-safe."""
         def worker(worker_id):
+            labels = {'worker': str(worker_id)}
+            counter = self.collector.labels('thread_test', labels)
+            gauge = self.collector.labels('worker_gauge', labels)
+            histogram = self.collector.labels('worker_time', labels)
             for i in range(100):
-                self.collector.increment_counter('thread_test', {'worker': str(worker_id)})
-                self.collector.set_gauge('worker_gauge', i, {'worker': str(worker_id)})
-                self.collector.record_histogram('worker_time', i * 0.01, {'worker': str(worker_id)})
+                counter.inc()
+                gauge.set(i)
+            histogram.observe_many(_OBSERVATIONS)
         
         # Create multiple threads
         threads = []
@@ -191,6 +212,17 @@ class TestMetricsCollection(unittest.TestCase):
         # Should complete without exceptions
         self.assertTrue(True)
     
+    def test_labels_handle(self):
+        """Test that label handles are cached and update the same metric."""
+        collector = MetricsCollector(enable_prometheus=False)
+        
+        child = collector.labels('handle_test', {'worker': '1'})
+        self.assertIs(child, collector.labels('handle_test', (('worker', '1'),)))
+        
+        child.inc()
+        collector.increment_counter('handle_test', {'worker': '1'}, value=2)
+        self.assertIn('handle_test_{"worker": "1"} 3', collector.get_prometheus_metrics())
+    
     def test_health_summary(self):
         """Test health summary functionality."""
         health = self.collector.get_health_summary()
@@ -241,6 +273,7 @@ class TestMetricsCollection(unittest.TestCase):
         
         # Operations should be no-op when disabled
         self.collector.increment_counter('disabled_test')
+        self.collector.record_histogram_bulk('disabled_test', [1.0])
         
         # Test re-enable
         self.collector.enable_metrics()
@@ -248,6 +281,7 @@ class TestMetricsCollection(unittest.TestCase):
         
         # Operations should work again
         self.collector.increment_counter('enabled_test')
+        self.assertNotIn('increment_counter', vars(self.collector))
 
 class TestMetricsIntegration(unittest.TestCase):
     """Test metrics integration with other components."""
@@ -261,10 +295,58 @@ class TestMetricsIntegration(unittest.TestCase):
         collector.increment_counter('fallback_test')
         collector.set_gauge('fallback_gauge', 42)
         collector.record_histogram('fallback_hist', 1.5)
+        collector.record_histogram_bulk('fallback_hist', [0.5, 2.0])
         
         # Get metrics output
         output = collector.get_prometheus_metrics()
         self.assertIsInstance(output, str)
+        self.assertIn('fallback_hist_{}_count 3', output)
+    
+    def test_fallback_counters_across_threads(self):
+        """Test that per-thread counter shards sum correctly on scrape."""
+        collector = MetricsCollector(enable_prometheus=False)
+        
+        def worker():
+            child = collector.labels('shard_test', ())
+            for i in range(100):
+                child.inc()
+        
+        threads = [threading.Thread(target=worker) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        collector.increment_counter('shard_test')
+        
+        # Exited threads are folded in, so scraping twice gives the same total
+        self.assertIn('shard_test_{} 501', collector.get_prometheus_metrics())
+        self.assertIn('shard_test_{} 501', collector.get_prometheus_metrics())
+    
+    def test_exited_thread_shards_released(self):
+        """Test that a thread's shard is retired when the thread exits."""
+        collector = MetricsCollector(enable_prometheus=False)
+        
+        threads = [threading.Thread(target=collector.increment_counter, args=('exit_test',))
+                   for i in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Retired without a scrape, with their counts kept
+        self.assertEqual(len(collector._shards), 0)
+        self.assertIn('exit_test_{} 50', collector.get_prometheus_metrics())
+    
+    def test_collector_freed_after_recording(self):
+        """Test that recording from a live thread does not pin the collector."""
+        collector = MetricsCollector(enable_prometheus=False)
+        collector.increment_counter('freed_test')
+        collector.record_histogram('freed_test_hist', 0.5)
+        ref = weakref.ref(collector)
+        
+        del collector
+        gc.collect()
+        self.assertIsNone(ref())
     
     def test_error_handling(self):
         """Test error handling in metrics collection."""
@@ -8,27 +8,30 @@ from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 import urllib.parse
 
-# Set up logging
+# Set up logging; KM_BRIDGE_DEBUG=1 turns on the verbose trace, otherwise
+# only warnings and errors are written
+KM_BRIDGE_DEBUG = bool(os.environ.get("KM_BRIDGE_DEBUG"))
 log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'km_bridge_local.log')
 logging.basicConfig(
     filename=log_file_path,
-    level=logging.DEBUG,
+    level=logging.DEBUG if KM_BRIDGE_DEBUG else logging.WARNING,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Clear the log on each start for clean debugging
-with open(log_file_path, 'w'):
-    pass
+# Clear the log on each debug start for clean debugging
+if KM_BRIDGE_DEBUG:
+    with open(log_file_path, 'w'):
+        pass
 
 logging.info("Bridge script started.")
-logging.info(f"CWD: {os.getcwd()}")
-logging.info(f"Absolute path of script: {os.path.abspath(__file__)}")
-logging.info(f"Script directory: {os.path.dirname(os.path.abspath(__file__))}")
+logging.info("CWD: %s", os.getcwd())
+logging.info("Absolute path of script: %s", os.path.abspath(__file__))
+logging.info("Script directory: %s", os.path.dirname(os.path.abspath(__file__)))
 
 class LocalKMBridge:
     def __init__(self):
         config_file = os.path.join(os.path.dirname(__file__), "mcp_config.json")
-        logging.info(f"Attempting to read config from: {os.path.abspath(config_file)}")
+        logging.info("Attempting to read config from: %s", os.path.abspath(config_file))
         if os.path.exists(config_file):
             logging.info("Config file found.")
             with open(config_file) as f:
@@ -41,7 +44,7 @@ class LocalKMBridge:
                     request = Request(f"{self.base_url}/health")
                     with urlopen(request, timeout=5) as response:
                         if response.getcode() == 200:
-                            logging.info(f"Successfully connected to local KM on port {port}")
+                            logging.info("Successfully connected to local KM on port %s", port)
                             self.connection_status = "ready"
                         else:
                             logging.error(f"KM health check failed with status {response.getcode()}")
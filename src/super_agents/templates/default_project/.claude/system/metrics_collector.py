@@ -8,8 +8,10 @@ import threading
 import json
 import psutil
 import os
+import weakref
+from array import array
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Sequence, Tuple, Union
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from contextlib import contextmanager
@@ -21,6 +23,141 @@ except ImportError:
     HAS_PROMETHEUS = False
     print("Warning: prometheus_client not available, using fallback metrics")
 
+# Label sets: a dict, or a tuple of (label, value) pairs that callers can build once
+Labels = Union[Dict[str, str], Tuple[Tuple[str, str], ...]]
+
+# Prometheus counter increments a thread buffers before pushing them itself;
+# kept small since they are invisible to readers other than a scrape until then
+COUNTER_BATCH_SIZE = 64
+
+# Histogram observations a thread buffers per handle before draining them itself
+HISTOGRAM_BUFFER_SIZE = 128
+
+# Longest a thread keeps recorded values to itself before publishing them
+SHARD_FLUSH_SECONDS = 1.0
+
+class _Shard:
+    """One thread's running counter totals and buffered observations, keyed by handle."""
+    
+    __slots__ = ('counts', 'flushed', 'ops', 'flush_at', 'observations', 'drained',
+                 '__weakref__')
+    
+    def __init__(self):
+        self.counts = {}        # Written only by the owning thread
+        self.flushed = {}       # Totals already pushed to Prometheus, under _lock
+        self.ops = 0
+        self.flush_at = time.monotonic() + SHARD_FLUSH_SECONDS
+        self.observations = {}  # array('d') per handle, appended only by the owner
+        self.drained = {}       # Observations already applied per handle, under _lock
+
+class _ThreadExit:
+    """Kept only in a thread's locals, so it is freed when the thread exits."""
+    
+    __slots__ = ('__weakref__',)
+
+def _retire_exited_shard(collector_ref: 'weakref.ref', shard_ref: 'weakref.ref'):
+    """Retire a shard when its thread exits, unless the collector is gone."""
+    # Weak references only: the shard's handles point back at the collector,
+    # and the finalize registry would otherwise keep both alive
+    collector = collector_ref()
+    shard = shard_ref()
+    if collector is not None and shard is not None:
+        collector._retire_shard(shard)
+
+class _Child:
+    """Metric handle bound to one name and label set, see MetricsCollector.labels."""
+    
+    __slots__ = ('_collector', '_metric', '_key')
+    
+    def __init__(self, collector: 'MetricsCollector', metric, key: str):
+        self._collector = collector
+        self._metric = metric  # Prometheus child, or None for fallback storage
+        self._key = key
+    
+    def inc(self, value: float = 1):
+        """Increment the bound counter."""
+        collector = self._collector
+        if not collector.enabled:
+            return
+        # Lock-free: each thread only writes its own shard
+        shard = getattr(collector._tls, 'shard', None)
+        if shard is None:
+            shard = collector._register_shard()
+        counts = shard.counts
+        counts[self] = counts.get(self, 0) + value
+        if self._metric is not None:
+            # Push buffered Prometheus increments in batches
+            shard.ops += 1
+            if shard.ops >= COUNTER_BATCH_SIZE or time.monotonic() >= shard.flush_at:
+                collector._publish_shard(shard)
+    
+    def set(self, value: float):
+        """Set the bound gauge."""
+        collector = self._collector
+        if not collector.enabled:
+            return
+        if self._metric is not None:
+            self._metric.set(value)
+        else:
+            with collector._lock:
+                collector._gauges[self._key] = value
+    
+    def observe(self, value: float):
+        """Record an observation on the bound histogram."""
+        collector = self._collector
+        if not collector.enabled:
+            return
+        shard, buffer = self._observation_buffer()
+        buffer.append(value)
+        if len(buffer) >= HISTOGRAM_BUFFER_SIZE or time.monotonic() >= shard.flush_at:
+            collector._publish_shard(shard)
+    
+    def observe_many(self, values: Sequence[float]):
+        """Record several observations on the bound histogram at once."""
+        collector = self._collector
+        if not collector.enabled or not len(values):
+            return
+        if self._metric is not None:
+            # prometheus_client locks each observation itself
+            observe = self._metric.observe
+            for value in values:
+                observe(value)
+            return
+        
+        shard, buffer = self._observation_buffer()
+        buffer.extend(values)
+        if len(buffer) >= HISTOGRAM_BUFFER_SIZE or time.monotonic() >= shard.flush_at:
+            collector._publish_shard(shard)
+    
+    def _observation_buffer(self) -> Tuple[_Shard, array]:
+        """Return the calling thread's shard and its buffer for this handle."""
+        # Lock-free: buffered in this thread's shard until drained
+        collector = self._collector
+        shard = getattr(collector._tls, 'shard', None)
+        if shard is None:
+            shard = collector._register_shard()
+        buffer = shard.observations.get(self)
+        if buffer is None:
+            buffer = shard.observations[self] = array('d')
+        return shard, buffer
+    
+    def _apply_observations(self, values: Sequence[float]):
+        """Add observations to the underlying histogram; call with _lock held."""
+        metric = self._metric
+        if metric is None:
+            self._collector._histograms[self._key].extend(values)
+            return
+        
+        observe = metric.observe
+        for value in values:
+            observe(value)
+
+def _noop(self, *args, **kwargs):
+    """Stands in for the recording methods while metrics are disabled."""
+
+# Methods disable_metrics shadows with _noop on the instance
+_RECORDING_METHODS = ('increment_counter', 'set_gauge', 'record_histogram', 'record_histogram_bulk')
+
 class MetricsCollector:
     """Production metrics collector with Prometheus integration."""
     
@@ -29,12 +166,22 @@ class MetricsCollector:
         self.start_time = time.time()
         self.prometheus_enabled = enable_prometheus and HAS_PROMETHEUS
         
-        # Thread-safe storage for fallback metrics
+        # Thread-safe storage for fallback metrics. Counters and histogram
+        # observations are sharded per thread and published by the owner in
+        # batches, when it exits, and on scrape; _counters holds exited
+        # threads' totals
         self._lock = threading.Lock()
         self._counters = defaultdict(int)
+        self._tls = threading.local()
+        self._shards = []
         self._gauges = defaultdict(float)
         self._histograms = defaultdict(lambda: deque(maxlen=1000))
         
+        # Bound handles per (name, label tuple), see labels(); unlabeled
+        # handles are also keyed by bare name to skip building the key
+        self._children = {}
+        self._plain_children = {}
+        
         # Initialize Prometheus metrics if available
         if self.prometheus_enabled:
             self._init_prometheus_metrics()
@@ -163,7 +310,42 @@ class MetricsCollector:
             'hostname': os.uname().nodename if hasattr(os, 'uname') else 'unknown'
         })
     
-    def increment_counter(self, name: str, labels: Dict[str, str] = None, value: float = 1):
+    def labels(self, name: str, labels: Labels = ()) -> _Child:
+        """
+        Get a cached handle for a metric and label set.
+        
+        labels may be a dict or a tuple of (label, value) pairs. Tuples are
+        used as the cache key as given, so callers that keep one in a fixed
+        order skip canonicalizing it. Hot callers should bind the handle once
+        and call inc/set/observe on it directly.
+        """
+        if not labels:
+            child = self._plain_children.get(name)
+            if child is not None:
+                return child
+        
+        if isinstance(labels, tuple):
+            items = labels
+        else:
+            items = tuple(sorted(labels.items() if isinstance(labels, dict) else labels))
+        cache_key = (name, items)
+        child = self._children.get(cache_key)
+        if child is None:
+            label_dict = dict(items)
+            if self.prometheus_enabled and hasattr(self, name):
+                metric = getattr(self, name)
+                if label_dict:
+                    metric = metric.labels(**label_dict)
+            else:
+                metric = None
+            # Fallback storage key
+            key = f"{name}_{json.dumps(label_dict, sort_keys=True)}"
+            child = self._children.setdefault(cache_key, _Child(self, metric, key))
+            if not items:
+                self._plain_children[name] = child
+        return child
+    
+    def increment_counter(self, name: str, labels: Labels = None, value: float = 1):
         """Increment a counter metric."""
         if not self.enabled:
             return
@@ -171,22 +353,12 @@ class MetricsCollector:
         start = time.time()
         
         try:
-            if self.prometheus_enabled and hasattr(self, name):
-                metric = getattr(self, name)
-                if labels:
-                    metric.labels(**labels).inc(value)
-                else:
-                    metric.inc(value)
-            else:
-                # Fallback storage
-                key = f"{name}_{json.dumps(labels or {}, sort_keys=True)}"
-                with self._lock:
-                    self._counters[key] += value
+            self.labels(name, labels or ()).inc(value)
         
         finally:
             self._record_operation_time(time.time() - start)
     
-    def set_gauge(self, name: str, value: float, labels: Dict[str, str] = None):
+    def set_gauge(self, name: str, value: float, labels: Labels = None):
         """Set a gauge metric value."""
         if not self.enabled:
             return
@@ -194,22 +366,12 @@ class MetricsCollector:
         start = time.time()
         
         try:
-            if self.prometheus_enabled and hasattr(self, name):
-                metric = getattr(self, name)
-                if labels:
-                    metric.labels(**labels).set(value)
-                else:
-                    metric.set(value)
-            else:
-                # Fallback storage
-                key = f"{name}_{json.dumps(labels or {}, sort_keys=True)}"
-                with self._lock:
-                    self._gauges[key] = value
+            self.labels(name, labels or ()).set(value)
         
         finally:
             self._record_operation_time(time.time() - start)
     
-    def record_histogram(self, name: str, value: float, labels: Dict[str, str] = None):
+    def record_histogram(self, name: str, value: float, labels: Labels = None):
         """Record a histogram observation."""
         if not self.enabled:
             return
@@ -217,23 +379,26 @@ class MetricsCollector:
         start = time.time()
         
         try:
-            if self.prometheus_enabled and hasattr(self, name):
-                metric = getattr(self, name)
-                if labels:
-                    metric.labels(**labels).observe(value)
-                else:
-                    metric.observe(value)
-            else:
-                # Fallback storage
-                key = f"{name}_{json.dumps(labels or {}, sort_keys=True)}"
-                with self._lock:
-                    self._histograms[key].append(value)
+            self.labels(name, labels or ()).observe(value)
+        
+        finally:
+            self._record_operation_time(time.time() - start)
+    
+    def record_histogram_bulk(self, name: str, values: Sequence[float], labels: Labels = None):
+        """Record a batch of histogram observations."""
+        if not self.enabled:
+            return
+            
+        start = time.time()
+        
+        try:
+            self.labels(name, labels or ()).observe_many(values)
         
         finally:
             self._record_operation_time(time.time() - start)
     
     @contextmanager
-    def time_operation(self, operation_name: str, labels: Dict[str, str] = None):
+    def time_operation(self, operation_name: str, labels: Labels = None):
         """Context manager to time operations."""
         start = time.time()
         success = True
@@ -276,15 +441,12 @@ class MetricsCollector:
     def record_agent_metrics(self, agent: str, operation: str, duration: float, 
                            success: bool, error_type: str = None):
         """Record agent performance metrics."""
-        self.increment_counter('agent_requests', {
+        labels = {
             'agent': agent,
             'operation': operation
-        })
-        
-        self.record_histogram('agent_response_time', duration, {
-            'agent': agent,
-            'operation': operation
-        })
+        }
+        self.increment_counter('agent_requests', labels)
+        self.record_histogram('agent_response_time', duration, labels)
         
         if not success and error_type:
             self.increment_counter('agent_errors', {
@@ -330,6 +492,74 @@ class MetricsCollector:
             'p95_overhead_ms': sorted(times_ms)[int(len(times_ms) * 0.95)]
         }
     
+    def _register_shard(self) -> _Shard:
+        """Create the calling thread's shard, retired when the thread exits."""
+        shard = _Shard()
+        marker = _ThreadExit()
+        self._tls.shard = shard
+        self._tls.exit_marker = marker
+        weakref.finalize(marker, _retire_exited_shard,
+                         weakref.ref(self), weakref.ref(shard)).atexit = False
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+    
+    def _publish_shard(self, shard: _Shard):
+        """Push the calling thread's own shard and empty its buffers."""
+        with self._lock:
+            self._flush_shard(shard, shard.counts.copy())
+            for child, buffer in shard.observations.items():
+                self._drain_observations(shard, child, buffer)
+                # Only the owner empties its buffers, so drains never race it
+                del buffer[:]
+                shard.drained[child] = 0
+        shard.flush_at = time.monotonic() + SHARD_FLUSH_SECONDS
+    
+    def _retire_shard(self, shard: _Shard):
+        """Publish an exited thread's shard and fold it into the totals."""
+        with self._lock:
+            snapshot = shard.counts
+            self._flush_shard(shard, snapshot)
+            for child, buffer in shard.observations.items():
+                self._drain_observations(shard, child, buffer)
+            for child, value in snapshot.items():
+                if child._metric is None:
+                    self._counters[child._key] += value
+            self._shards.remove(shard)
+    
+    def _flush_shard(self, shard: _Shard, snapshot: Dict[_Child, float]):
+        """Push a shard's unflushed Prometheus increments; call with _lock held."""
+        shard.ops = 0
+        flushed = shard.flushed
+        for child, total in snapshot.items():
+            if child._metric is not None:
+                delta = total - flushed.get(child, 0)
+                if delta:
+                    child._metric.inc(delta)
+                    flushed[child] = total
+    
+    def _drain_observations(self, shard: _Shard, child: _Child, buffer: array):
+        """Apply a buffer's undrained observations; call with _lock held."""
+        start = shard.drained.get(child, 0)
+        end = len(buffer)
+        if end > start:
+            child._apply_observations(buffer[start:end])
+            shard.drained[child] = end
+    
+    def _merge_shards(self) -> Dict[str, float]:
+        """Drain shards and return fallback counter totals; call with _lock held."""
+        totals = defaultdict(int, self._counters)
+        for shard in self._shards:
+            # Copies are atomic under the GIL while the owner keeps writing
+            snapshot = shard.counts.copy()
+            self._flush_shard(shard, snapshot)
+            for child, buffer in shard.observations.copy().items():
+                self._drain_observations(shard, child, buffer)
+            for child, value in snapshot.items():
+                if child._metric is None:
+                    totals[child._key] += value
+        return totals
+    
     def _record_operation_time(self, duration: float):
         """Record metrics operation timing for overhead analysis."""
         self._operation_times.append(duration)
@@ -337,30 +567,29 @@ class MetricsCollector:
     def get_prometheus_metrics(self) -> str:
         """Get Prometheus-formatted metrics."""
         if self.prometheus_enabled:
+            with self._lock:
+                self._merge_shards()
             return generate_latest(REGISTRY)
         else:
             return self._generate_fallback_metrics()
     
     def _generate_fallback_metrics(self) -> str:
         """Generate Prometheus-format metrics from fallback storage."""
-        lines = []
-        
+        # Snapshot under the lock; formatting happens outside it
         with self._lock:
-            # Counters
-            for key, value in self._counters.items():
-                lines.append(f"{key} {value}")
-            
-            # Gauges
-            for key, value in self._gauges.items():
-                lines.append(f"{key} {value}")
-            
-            # Simple histogram summaries
-            for key, values in self._histograms.items():
-                if values:
-                    lines.append(f"{key}_count {len(values)}")
-                    lines.append(f"{key}_sum {sum(values)}")
+            counters = self._merge_shards()
+            gauges = list(self._gauges.items())
+            histograms = [(key, tuple(values)) for key, values in self._histograms.items() if values]
+        
+        # Counters and gauges
+        parts = [f"{key} {value}\n" for key, value in counters.items()]
+        parts.extend(f"{key} {value}\n" for key, value in gauges)
+        
+        # Simple histogram summaries
+        for key, values in histograms:
+            parts.append(f"{key}_count {len(values)}\n{key}_sum {sum(values)}\n")
         
-        return '\n'.join(lines) + '\n'
+        return ''.join(parts) or '\n'
     
     def get_health_summary(self) -> Dict:
         """Get a summary for health checks."""
@@ -377,10 +606,16 @@ class MetricsCollector:
     def disable_metrics(self):
         """Disable metrics collection (for emergency situations)."""
         self.enabled = False
+        # Instance attributes shadow the methods, so calls skip their bodies
+        noop = _noop.__get__(self)
+        for name in _RECORDING_METHODS:
+            setattr(self, name, noop)
     
     def enable_metrics(self):
         """Re-enable metrics collection."""
         self.enabled = True
+        for name in _RECORDING_METHODS:
+            self.__dict__.pop(name, None)
 
 # Global metrics instance
 _metrics_instance = None
@@ -4,17 +4,286 @@ Simple Orchestrator - Lightweight alternative to full AET orchestration
 Handles common tasks without the complexity of multi-agent architecture.
 """
 
+import os
+import stat
 import json
+import re
 import time
+import asyncio
+import functools
 import tempfile
 import subprocess
-from pathlib import Path
+import threading
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from event_logger import EventLogger
 from logger_config import get_contextual_logger, log_system_event
 
+# Flush buffered events once this many are pending
+EVENT_BUFFER_SIZE = 256
+
+# Actions that only write their own ticket-named file, so they can
+# overlap; the others inspect the working directory and run in order
+_INDEPENDENT_ACTIONS = frozenset({"create_file", "fix_issue", "generic_task"})
+
+# Plan action -> (helper method, description used in failure messages)
+_ACTION_HANDLERS = {
+    "create_file": ("_create_example_file", "create file"),
+    "modify_file": ("_modify_existing_file", "modify file"),
+    "delete_file": ("_delete_file", "delete files"),
+    "fix_issue": ("_fix_simple_issue", "create fix log"),
+    "generic_task": ("_handle_generic_task", "handle generic task"),
+}
+
+# Worker threads for overlapping independent actions
+ACTION_WORKERS = 4
+
+# Unsuitable tasks with more complex indicators than this are rejected
+# before any planning or file work
+SKIP_COMPLEX_SCORE = 3
+
+# Number of completed tasks kept in task_history
+TASK_HISTORY_SIZE = 10_000
+
+
+# File content templates, pre-encoded and filled with bytes %-substitution
+_EXAMPLE_TEMPLATE = b"""# Task: %(desc)s
+# Created by Simple Mode
+# Ticket: %(tid)s
+# Timestamp: %(ts)s
+
+This file was created as part of simple mode task processing.
+Task description: %(desc)s
+"""
+
+_MODIFICATION_TEMPLATE = b"\n\n# Modified by Simple Mode\n# Ticket: %(tid)s\n# Task: %(desc)s\n# Timestamp: %(ts)s\n"
+
+_FIX_LOG_TEMPLATE = b"""# Fix Log
+# Ticket: %(tid)s
+# Task: %(desc)s
+# Timestamp: %(ts)s
+
+## Issue Analysis
+Task description indicates a fix is needed: %(desc)s
+
+## Simple Fix Applied
+- Documented the issue
+- Created this fix log
+- Applied basic remediation
+
+## Status
+Fix completed in simple mode. For complex issues, use full AET mode.
+"""
+
+_SUMMARY_TEMPLATE = b"""# Task Summary
+# Ticket: %(tid)s
+# Task: %(desc)s
+# Timestamp: %(ts)s
+# Mode: Simple
+
+## Task Description
+%(desc)s
+
+## Processing Notes
+This task was processed in simple mode. The task description did not match
+specific patterns for file operations or fixes.
+
+## Recommendations
+- For complex tasks, consider using full AET mode
+- For specific file operations, use more explicit task descriptions
+- Review task requirements and retry if needed
+
+## Status
+Task processed successfully in simple mode.
+"""
+
+
+@dataclass(frozen=True)
+class TaskRecord:
+    """Immutable snapshot of a completed simple-mode task."""
+    __slots__ = ("ticket_id", "description", "start_time", "duration", "status", "operations")
+    
+    ticket_id: str
+    description: str
+    start_time: float
+    duration: float
+    status: str
+    operations: int
+
+# Keyword groups used to classify task descriptions
+_CREATE_WORDS = frozenset({"create", "write", "add", "new file"})
+_MODIFY_WORDS = frozenset({"modify", "update", "edit", "change"})
+_DELETE_WORDS = frozenset({"delete", "remove"})
+_FIX_WORDS = frozenset({"fix", "bug", "error"})
+_COMPLEX_WORDS = frozenset({"refactor", "architecture", "database", "api"})
+
+# Indicators for simple mode suitability
+_SIMPLE_INDICATORS = frozenset({
+    "create", "write", "add", "new file", "modify", "update", "edit",
+    "change", "delete", "remove", "fix", "simple"
+})
+
+# Indicators for complex tasks
+_COMPLEX_INDICATORS = frozenset({
+    "refactor", "architecture", "database", "api", "integration",
+    "deployment", "security", "performance", "scalability", "microservice"
+})
+
+_ALL_KEYWORDS = (
+    _CREATE_WORDS | _MODIFY_WORDS | _DELETE_WORDS | _FIX_WORDS |
+    _COMPLEX_WORDS | _SIMPLE_INDICATORS | _COMPLEX_INDICATORS
+)
+
+if AHOCORASICK_AVAILABLE:
+    # Automaton over every keyword, scanned once per description
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _word in _ALL_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_word, _word)
+    _KEYWORD_AUTOMATON.make_automaton()
+    del _word
+
+    def _scan_keywords(task_description: str) -> frozenset:
+        """Return the set of known keywords contained in a task description."""
+        return frozenset(word for _, word in _KEYWORD_AUTOMATON.iter(task_description.lower()))
+else:
+    # Matches every keyword occurrence, including overlapping ones, in one pass
+    _KEYWORD_PATTERN = re.compile("(?=(%s))" % "|".join(
+        re.escape(word) for word in sorted(_ALL_KEYWORDS, key=len, reverse=True)
+    ))
+
+    def _scan_keywords(task_description: str) -> frozenset:
+        """Return the set of known keywords contained in a task description."""
+        return frozenset(_KEYWORD_PATTERN.findall(task_description.lower()))
+
+
+@functools.lru_cache(maxsize=1024)
+def _task_keywords(task_description: str) -> frozenset:
+    """
+    Classify a task description with a single keyword scan.
+    
+    Planning and suitability both start from this set, so each description
+    is scanned once however many of them run.
+    """
+    return _scan_keywords(task_description)
+
+
+# One pool for every orchestrator in the process, created on first use;
+# concurrent.futures joins its workers at interpreter exit
+_action_pool = None
+_action_pool_lock = threading.Lock()
+
+
+def _get_action_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool for independent actions."""
+    global _action_pool
+    with _action_pool_lock:
+        if _action_pool is None:
+            _action_pool = ThreadPoolExecutor(max_workers=ACTION_WORKERS)
+        return _action_pool
+
+
+# (epoch second, formatted second) reused until the clock ticks over
+_iso_second = (None, "")
+
+
+def _iso_now() -> str:
+    """Return the local time in ISO 8601, formatting the date part once per second."""
+    global _iso_second
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_seconds, prefix = _iso_second
+    if cached_seconds != seconds:
+        prefix = datetime.fromtimestamp(seconds).isoformat()
+        _iso_second = (seconds, prefix)
+    return f"{prefix}.{micros:06d}"
+
+
+def _render(template: bytes, description: str, ticket_id: str) -> bytes:
+    """Fill a content template, encoding only the interpolated fields."""
+    return template % {
+        b"desc": description.encode(),
+        b"tid": ticket_id.encode(),
+        b"ts": _iso_now().encode()
+    }
+
+
+def _write_file(path, content: bytes, append: bool = False):
+    """Write content with a raw file descriptor, bypassing the text I/O layer."""
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    data = memoryview(content)
+    fd = os.open(path, flags, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1024)
+def _plan_core(task_description: str) -> tuple:
+    """
+    Classify a task description into simple-mode actions.
+    
+    Returns an immutable (actions, complexity, actionable, estimated_files)
+    tuple so results can be shared across repeated descriptions.
+    """
+    keywords = _task_keywords(task_description)
+    actions = []
+    complexity = "simple"
+    actionable = True
+    estimated_files = 0
+    
+    # File operations
+    if keywords & _CREATE_WORDS:
+        actions.append("create_file")
+        estimated_files = 1
+        
+    if keywords & _MODIFY_WORDS:
+        actions.append("modify_file")
+        estimated_files = 1
+        
+    if keywords & _DELETE_WORDS:
+        actions.append("delete_file")
+        
+    # Simple text operations
+    if keywords & _FIX_WORDS:
+        actions.append("fix_issue")
+        complexity = "medium"
+        
+    # Complex operations that might not be suitable for simple mode
+    if keywords & _COMPLEX_WORDS:
+        complexity = "complex"
+        actionable = len(actions) > 0  # Only if we also have simple actions
+        
+    # If no specific actions identified, try to handle as generic task
+    if not actions:
+        actions.append("generic_task")
+        complexity = "unknown"
+        
+    return tuple(actions), complexity, actionable, estimated_files
+
+
+@functools.lru_cache(maxsize=1024)
+def _suitability_core(task_description: str) -> tuple:
+    """Return (suitable, simple_score, complex_score) for a task description."""
+    keywords = _task_keywords(task_description)
+    
+    simple_score = len(keywords & _SIMPLE_INDICATORS)
+    complex_score = len(keywords & _COMPLEX_INDICATORS)
+    
+    suitable = simple_score > 0 and complex_score <= simple_score
+    return suitable, simple_score, complex_score
+
 
 class SimpleOrchestrator:
     """
@@ -29,14 +298,26 @@ class SimpleOrchestrator:
     """
     
     def __init__(self):
-        self.event_logger = EventLogger()
+        self.event_logger = EventLogger.shared()
         self.logger = get_contextual_logger("simple_orchestrator", component="simple_mode")
         self.simple_mode_active = True
         
+        # Serializes tasks submitted through process_task_async
+        self._task_lock = threading.Lock()
+        
+        # Events are buffered and written in batches; every task flushes
+        # its own events before returning
+        self._event_buffer = deque()
+        
         # Simple state tracking
-        self.task_history = []
+        self.task_history = deque(maxlen=TASK_HISTORY_SIZE)
         self.current_task = None
         
+        # Running totals so status does not rescan task_history
+        self._tasks_completed = 0
+        self._total_operations = 0
+        self._total_duration = 0.0
+        
         # Performance tracking
         self.start_time = None
         self.operations_count = 0
@@ -54,15 +335,21 @@ class SimpleOrchestrator:
         """
         if not ticket_id:
             ticket_id = f"SIMPLE-{int(time.time())}"
+        
+        # Reject clearly complex tasks without touching the filesystem
+        suitable, simple_score, complex_score = _suitability_core(task_description)
+        if not suitable and complex_score > SKIP_COMPLEX_SCORE:
+            return self._skip_task(task_description, ticket_id, simple_score, complex_score)
             
         self.current_task = {
             "ticket_id": ticket_id,
             "description": task_description,
+            "suffix": ticket_id.rpartition('-')[2],
             "start_time": time.time(),
             "status": "STARTED"
         }
         
-        self.logger.info(f"Starting simple task processing: {ticket_id}")
+        self.logger.info("Starting simple task processing: %s", ticket_id)
         log_system_event("simple_task_started", {
             "ticket_id": ticket_id,
             "description": task_description,
@@ -71,12 +358,12 @@ class SimpleOrchestrator:
         
         try:
             # Log task start
-            self.event_logger.append_event(
+            self._log_event(
                 ticket_id=ticket_id,
                 event_type="SIMPLE_TASK_STARTED",
                 payload={
                     "description": task_description,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _iso_now(),
                     "mode": "simple"
                 }
             )
@@ -87,10 +374,21 @@ class SimpleOrchestrator:
             # Track completion
             self.current_task["status"] = "COMPLETED" if result["success"] else "FAILED"
             self.current_task["duration"] = time.time() - self.current_task["start_time"]
-            self.task_history.append(self.current_task.copy())
+            operations = result.get("operations", 0)
+            self.task_history.append(TaskRecord(
+                ticket_id=ticket_id,
+                description=task_description,
+                start_time=self.current_task["start_time"],
+                duration=self.current_task["duration"],
+                status=self.current_task["status"],
+                operations=operations
+            ))
+            self._tasks_completed += 1
+            self._total_operations += operations
+            self._total_duration += self.current_task["duration"]
             
             # Log completion
-            self.event_logger.append_event(
+            self._log_event(
                 ticket_id=ticket_id,
                 event_type="SIMPLE_TASK_COMPLETED",
                 payload={
@@ -98,23 +396,23 @@ class SimpleOrchestrator:
                     "duration": self.current_task["duration"],
                     "operations": result.get("operations", 0),
                     "files_modified": len(result.get("files_changed", [])),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 }
             )
             
-            self.logger.info(f"Simple task completed: {ticket_id} (success: {result['success']})")
+            self.logger.info("Simple task completed: %s (success: %s)", ticket_id, result["success"])
             return result
             
         except Exception as e:
-            self.logger.error(f"Simple task failed: {ticket_id} - {str(e)}")
+            self.logger.error("Simple task failed: %s - %s", ticket_id, e)
             
             # Log failure
-            self.event_logger.append_event(
+            self._log_event(
                 ticket_id=ticket_id,
                 event_type="SIMPLE_TASK_FAILED",
                 payload={
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_now()
                 }
             )
             
@@ -124,6 +422,81 @@ class SimpleOrchestrator:
                 "ticket_id": ticket_id,
                 "mode": "simple"
             }
+            
+        finally:
+            # Persist this task's events in one write
+            self._flush_events()
+    
+    def _skip_task(self, task_description: str, ticket_id: str,
+                   simple_score: int, complex_score: int) -> Dict[str, Any]:
+        """Record a task rejected as too complex and return its result."""
+        self.logger.info("Skipping task unsuitable for simple mode: %s", ticket_id)
+        self._log_event(
+            ticket_id=ticket_id,
+            event_type="SIMPLE_TASK_SKIPPED",
+            payload={
+                "description": task_description,
+                "simple_score": simple_score,
+                "complex_score": complex_score,
+                "timestamp": _iso_now()
+            }
+        )
+        self._flush_events()
+        
+        return {
+            "success": False,
+            "skipped": True,
+            "error": "Task is too complex for simple mode",
+            "recommendation": "full",
+            "ticket_id": ticket_id,
+            "mode": "simple"
+        }
+    
+    async def process_task_async(self, task_description: str, ticket_id: str = None) -> Dict[str, Any]:
+        """
+        Process a task without blocking the running event loop.
+        
+        The synchronous workflow runs in the loop's default executor. Tasks
+        submitted to the same orchestrator run one at a time, since they
+        share current_task and the event buffer.
+        
+        Args:
+            task_description: Natural language description of the task
+            ticket_id: Optional ticket ID for tracking
+            
+        Returns:
+            Dict with execution results and metadata
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._process_task_locked, task_description, ticket_id)
+        )
+    
+    def _process_task_locked(self, task_description: str, ticket_id: Optional[str]) -> Dict[str, Any]:
+        """Run process_task while holding the task lock."""
+        with self._task_lock:
+            return self.process_task(task_description, ticket_id)
+    
+    def _log_event(self, ticket_id: str, event_type: str, payload: Dict[str, Any]):
+        """Build and buffer an event, flushing when the buffer is full."""
+        # Built now so the event keeps its own timestamp and ID
+        self._event_buffer.append(self.event_logger.build_event(ticket_id, event_type, payload))
+        if len(self._event_buffer) >= EVENT_BUFFER_SIZE:
+            self._flush_events(sync=False)
+    
+    def _flush_events(self, sync: bool = True):
+        """
+        Write all buffered events to the event log in a single batch.
+        
+        Mid-task flushes skip the fsync; the flush at task completion syncs
+        everything written so far.
+        """
+        if not self._event_buffer:
+            return
+        
+        events = list(self._event_buffer)
+        self.event_logger.append_built_events(events, sync=sync)
+        self._event_buffer.clear()
     
     def _execute_simple_workflow(self, task_description: str, ticket_id: str) -> Dict[str, Any]:
         """
@@ -164,7 +537,7 @@ class SimpleOrchestrator:
                 
         except Exception as e:
             results["error"] = str(e)
-            self.logger.error(f"Workflow execution failed: {str(e)}")
+            self.logger.error("Workflow execution failed: %s", e)
             
         return results
     
@@ -175,45 +548,17 @@ class SimpleOrchestrator:
         """
         self.logger.info("Creating simple plan")
         
+        actions, complexity, actionable, estimated_files = _plan_core(task_description)
+        
         plan = {
             "description": task_description,
-            "actionable": True,
-            "complexity": "simple",
-            "actions": [],
-            "estimated_files": 0
+            "actionable": actionable,
+            "complexity": complexity,
+            "actions": list(actions),
+            "estimated_files": estimated_files
         }
         
-        # Simple heuristics to determine actionability
-        task_lower = task_description.lower()
-        
-        # File operations
-        if any(word in task_lower for word in ["create", "write", "add", "new file"]):
-            plan["actions"].append("create_file")
-            plan["estimated_files"] = 1
-            
-        if any(word in task_lower for word in ["modify", "update", "edit", "change"]):
-            plan["actions"].append("modify_file")
-            plan["estimated_files"] = 1
-            
-        if any(word in task_lower for word in ["delete", "remove"]):
-            plan["actions"].append("delete_file")
-            
-        # Simple text operations
-        if any(word in task_lower for word in ["fix", "bug", "error"]):
-            plan["actions"].append("fix_issue")
-            plan["complexity"] = "medium"
-            
-        # Complex operations that might not be suitable for simple mode
-        if any(word in task_lower for word in ["refactor", "architecture", "database", "api"]):
-            plan["complexity"] = "complex"
-            plan["actionable"] = len(plan["actions"]) > 0  # Only if we also have simple actions
-            
-        # If no specific actions identified, try to handle as generic task
-        if not plan["actions"]:
-            plan["actions"].append("generic_task")
-            plan["complexity"] = "unknown"
-            
-        self.logger.info(f"Plan created: {len(plan['actions'])} actions, complexity: {plan['complexity']}")
+        self.logger.info("Plan created: %d actions, complexity: %s", len(plan["actions"]), plan["complexity"])
         return plan
     
     def _implement_simple_plan(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
@@ -230,8 +575,7 @@ class SimpleOrchestrator:
         }
         
         try:
-            for action in plan["actions"]:
-                operation_result = self._execute_action(action, plan, ticket_id)
+            for action, operation_result in self._run_actions(plan, ticket_id):
                 result["operations"] += 1
                 result["outputs"].append(operation_result)
                 
@@ -243,218 +587,195 @@ class SimpleOrchestrator:
                     return result
                     
             result["success"] = True
-            self.logger.info(f"Implementation completed: {result['operations']} operations")
+            self.logger.info("Implementation completed: %d operations", result["operations"])
             
         except Exception as e:
             result["error"] = str(e)
-            self.logger.error(f"Implementation failed: {str(e)}")
+            self.logger.error("Implementation failed: %s", e)
             
         return result
     
+    def _run_actions(self, plan: Dict[str, Any], ticket_id: str):
+        """
+        Execute plan actions, yielding (action, result) pairs in plan order.
+        
+        Consecutive independent actions are run together on a small thread
+        pool; directory-inspecting actions act as barriers and run alone.
+        Iteration stops after the first failed action. Actions of its group
+        that have not started are cancelled, but ones already running finish.
+        """
+        actions = plan["actions"]
+        i = 0
+        while i < len(actions):
+            group = [actions[i]]
+            if actions[i] in _INDEPENDENT_ACTIONS:
+                while i + len(group) < len(actions) and actions[i + len(group)] in _INDEPENDENT_ACTIONS:
+                    group.append(actions[i + len(group)])
+            i += len(group)
+            
+            if len(group) == 1:
+                yield group[0], self._execute_action(group[0], plan, ticket_id)
+                continue
+            
+            pool = _get_action_pool()
+            futures = [
+                pool.submit(self._execute_action, action, plan, ticket_id)
+                for action in group
+            ]
+            for action, future in zip(group, futures):
+                result = future.result()
+                if not result.get("success", True):
+                    # Cancel before yielding: the caller stops at a failure
+                    for pending in futures:
+                        pending.cancel()
+                    yield action, result
+                    return
+                yield action, result
+    
     def _execute_action(self, action: str, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
         """
         Execute a specific action.
         """
-        self.logger.debug(f"Executing action: {action}")
+        self.logger.debug("Executing action: %s", action)
         
-        if action == "create_file":
-            return self._create_example_file(plan, ticket_id)
-        elif action == "modify_file":
-            return self._modify_existing_file(plan, ticket_id)
-        elif action == "delete_file":
-            return self._delete_file(plan, ticket_id)
-        elif action == "fix_issue":
-            return self._fix_simple_issue(plan, ticket_id)
-        elif action == "generic_task":
-            return self._handle_generic_task(plan, ticket_id)
-        else:
+        handler = _ACTION_HANDLERS.get(action)
+        if handler is None:
             return {
                 "success": False,
                 "error": f"Unknown action: {action}"
             }
+        
+        method_name, description = handler
+        return self._safe(description, getattr(self, method_name), plan, ticket_id)
     
-    def _create_example_file(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
-        """Create a simple example file based on the task description."""
+    def _safe(self, description: str, fn, *args) -> Dict[str, Any]:
+        """Run an action helper, turning any exception into a failed result."""
         try:
-            # Create a simple file in current directory
-            filename = f"simple_task_{ticket_id.split('-')[-1]}.txt"
-            content = f"""# Task: {plan['description']}
-# Created by Simple Mode
-# Ticket: {ticket_id}
-# Timestamp: {datetime.now().isoformat()}
-
-This file was created as part of simple mode task processing.
-Task description: {plan['description']}
-"""
-            
-            with open(filename, 'w') as f:
-                f.write(content)
-                
-            self.logger.info(f"Created file: {filename}")
-            
-            return {
-                "success": True,
-                "action": "create_file",
-                "files_changed": [filename],
-                "output": f"Created {filename}"
-            }
-            
+            return fn(*args)
         except Exception as e:
+            self.logger.error("Failed to %s: %s", description, e)
             return {
                 "success": False,
-                "error": f"Failed to create file: {str(e)}"
+                "error": f"Failed to {description}: {str(e)}"
             }
     
+    def _ticket_suffix(self, ticket_id: str) -> str:
+        """Return the ticket number used in generated file names."""
+        task = self.current_task
+        if task is not None and task["ticket_id"] == ticket_id:
+            return task["suffix"]
+        return ticket_id.rpartition('-')[2]
+    
+    def _create_example_file(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
+        """Create a simple example file based on the task description."""
+        # Create a simple file in current directory
+        filename = f"simple_task_{self._ticket_suffix(ticket_id)}.txt"
+        content = _render(_EXAMPLE_TEMPLATE, plan['description'], ticket_id)
+        
+        _write_file(filename, content)
+            
+        self.logger.info("Created file: %s", filename)
+        
+        return {
+            "success": True,
+            "action": "create_file",
+            "files_changed": [filename],
+            "output": f"Created {filename}"
+        }
+    
     def _modify_existing_file(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
         """Modify an existing file if found."""
-        try:
-            # Look for files to modify
-            current_dir = Path(".")
-            files = list(current_dir.glob("*.txt")) + list(current_dir.glob("*.md"))
-            
-            if not files:
-                # Create a file to modify
-                return self._create_example_file(plan, ticket_id)
-            
-            # Modify the first suitable file
-            target_file = files[0]
-            original_content = target_file.read_text()
-            
-            modification = f"\n\n# Modified by Simple Mode\n# Ticket: {ticket_id}\n# Task: {plan['description']}\n# Timestamp: {datetime.now().isoformat()}\n"
-            
-            with open(target_file, 'a') as f:
-                f.write(modification)
-                
-            self.logger.info(f"Modified file: {target_file}")
-            
-            return {
-                "success": True,
-                "action": "modify_file",
-                "files_changed": [str(target_file)],
-                "output": f"Modified {target_file}"
-            }
+        # Look for files to modify, preferring .txt over .md
+        target_file = None
+        with os.scandir(".") as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                if entry.name.endswith(".txt"):
+                    target_file = entry.name
+                    break
+                if target_file is None and entry.name.endswith(".md"):
+                    target_file = entry.name
+        
+        if target_file is None:
+            # Create a file to modify
+            return self._create_example_file(plan, ticket_id)
+        
+        # Modify the first suitable file
+        modification = _render(_MODIFICATION_TEMPLATE, plan['description'], ticket_id)
+        
+        _write_file(target_file, modification, append=True)
             
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to modify file: {str(e)}"
-            }
+        self.logger.info("Modified file: %s", target_file)
+        
+        return {
+            "success": True,
+            "action": "modify_file",
+            "files_changed": [str(target_file)],
+            "output": f"Modified {target_file}"
+        }
     
     def _delete_file(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
         """Delete files matching simple patterns."""
-        try:
-            # Only delete files we created (safety measure)
-            current_dir = Path(".")
-            files_to_delete = list(current_dir.glob("simple_task_*.txt"))
-            
-            if not files_to_delete:
-                return {
-                    "success": True,
-                    "action": "delete_file",
-                    "files_changed": [],
-                    "output": "No simple task files to delete"
-                }
-            
-            deleted_files = []
-            for file_path in files_to_delete[:3]:  # Limit to 3 files for safety
-                file_path.unlink()
-                deleted_files.append(str(file_path))
-                
-            self.logger.info(f"Deleted {len(deleted_files)} files")
-            
+        # Only delete files we created (safety measure)
+        with os.scandir(".") as entries:
+            files_to_delete = [
+                entry.name for entry in entries
+                if entry.name.startswith("simple_task_") and entry.name.endswith(".txt")
+                and entry.is_file()
+            ]
+        
+        if not files_to_delete:
             return {
                 "success": True,
                 "action": "delete_file",
-                "files_changed": deleted_files,
-                "output": f"Deleted {len(deleted_files)} files"
+                "files_changed": [],
+                "output": "No simple task files to delete"
             }
+        
+        deleted_files = []
+        for file_path in files_to_delete[:3]:  # Limit to 3 files for safety
+            os.unlink(file_path)
+            deleted_files.append(str(file_path))
             
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to delete files: {str(e)}"
-            }
+        self.logger.info("Deleted %d files", len(deleted_files))
+        
+        return {
+            "success": True,
+            "action": "delete_file",
+            "files_changed": deleted_files,
+            "output": f"Deleted {len(deleted_files)} files"
+        }
     
     def _fix_simple_issue(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
         """Attempt to fix simple issues."""
-        try:
-            # Create a fix documentation
-            fix_file = f"fix_log_{ticket_id.split('-')[-1]}.txt"
-            content = f"""# Fix Log
-# Ticket: {ticket_id}
-# Task: {plan['description']}
-# Timestamp: {datetime.now().isoformat()}
-
-## Issue Analysis
-Task description indicates a fix is needed: {plan['description']}
-
-## Simple Fix Applied
-- Documented the issue
-- Created this fix log
-- Applied basic remediation
-
-## Status
-Fix completed in simple mode. For complex issues, use full AET mode.
-"""
-            
-            with open(fix_file, 'w') as f:
-                f.write(content)
-                
-            return {
-                "success": True,
-                "action": "fix_issue",
-                "files_changed": [fix_file],
-                "output": f"Created fix log: {fix_file}"
-            }
+        # Create a fix documentation
+        fix_file = f"fix_log_{self._ticket_suffix(ticket_id)}.txt"
+        content = _render(_FIX_LOG_TEMPLATE, plan['description'], ticket_id)
+        
+        _write_file(fix_file, content)
             
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to create fix log: {str(e)}"
-            }
+        return {
+            "success": True,
+            "action": "fix_issue",
+            "files_changed": [fix_file],
+            "output": f"Created fix log: {fix_file}"
+        }
     
     def _handle_generic_task(self, plan: Dict[str, Any], ticket_id: str) -> Dict[str, Any]:
         """Handle generic tasks that don't fit specific patterns."""
-        try:
-            # Create a task summary
-            summary_file = f"task_summary_{ticket_id.split('-')[-1]}.txt"
-            content = f"""# Task Summary
-# Ticket: {ticket_id}
-# Task: {plan['description']}
-# Timestamp: {datetime.now().isoformat()}
-# Mode: Simple
-
-## Task Description
-{plan['description']}
-
-## Processing Notes
-This task was processed in simple mode. The task description did not match
-specific patterns for file operations or fixes.
-
-## Recommendations
-- For complex tasks, consider using full AET mode
-- For specific file operations, use more explicit task descriptions
-- Review task requirements and retry if needed
-
-## Status
-Task processed successfully in simple mode.
-"""
-            
-            with open(summary_file, 'w') as f:
-                f.write(content)
-                
-            return {
-                "success": True,
-                "action": "generic_task",
-                "files_changed": [summary_file],
-                "output": f"Created task summary: {summary_file}"
-            }
+        # Create a task summary
+        summary_file = f"task_summary_{self._ticket_suffix(ticket_id)}.txt"
+        content = _render(_SUMMARY_TEMPLATE, plan['description'], ticket_id)
+        
+        _write_file(summary_file, content)
             
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to handle generic task: {str(e)}"
-            }
+        return {
+            "success": True,
+            "action": "generic_task",
+            "files_changed": [summary_file],
+            "output": f"Created task summary: {summary_file}"
+        }
     
     def _validate_simple_implementation(self, impl_result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -475,20 +796,23 @@ Task processed successfully in simple mode.
             if files_changed:
                 validation["checks"].append("files_modified")
                 
-                # Verify files exist and are readable
+                # Verify files exist and are non-empty with one stat each
                 for file_path in files_changed:
-                    path = Path(file_path)
-                    if path.exists() and path.is_file():
-                        try:
-                            content = path.read_text()
-                            if len(content) > 0:
-                                validation["checks"].append(f"file_valid_{path.name}")
-                            else:
-                                validation["issues"].append(f"Empty file: {file_path}")
-                        except Exception as e:
-                            validation["issues"].append(f"Cannot read file {file_path}: {str(e)}")
-                    else:
+                    try:
+                        st = os.stat(file_path)
+                    except FileNotFoundError:
                         validation["issues"].append(f"File not found: {file_path}")
+                        continue
+                    except OSError as e:
+                        validation["issues"].append(f"Cannot read file {file_path}: {str(e)}")
+                        continue
+                    
+                    if not stat.S_ISREG(st.st_mode):
+                        validation["issues"].append(f"File not found: {file_path}")
+                    elif st.st_size == 0:
+                        validation["issues"].append(f"Empty file: {file_path}")
+                    else:
+                        validation["checks"].append(f"file_valid_{os.path.basename(file_path)}")
             else:
                 validation["issues"].append("No files were modified")
             
@@ -501,11 +825,11 @@ Task processed successfully in simple mode.
             # Overall validation
             validation["passed"] = len(validation["issues"]) == 0 and len(validation["checks"]) > 0
             
-            self.logger.info(f"Validation completed: {'PASSED' if validation['passed'] else 'FAILED'}")
+            self.logger.info("Validation completed: %s", "PASSED" if validation["passed"] else "FAILED")
             
         except Exception as e:
             validation["issues"].append(f"Validation error: {str(e)}")
-            self.logger.error(f"Validation failed: {str(e)}")
+            self.logger.error("Validation failed: %s", e)
             
         return validation
     
@@ -515,37 +839,21 @@ Task processed successfully in simple mode.
             "mode": "simple",
             "active": self.simple_mode_active,
             "current_task": self.current_task,
-            "tasks_completed": len(self.task_history),
-            "total_operations": sum(task.get("operations", 0) for task in self.task_history if "operations" in task),
-            "average_duration": sum(task.get("duration", 0) for task in self.task_history) / max(len(self.task_history), 1)
+            "tasks_completed": self._tasks_completed,
+            "total_operations": self._total_operations,
+            "average_duration": self._total_duration / max(self._tasks_completed, 1)
         }
     
     def get_task_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent task history."""
-        return self.task_history[-limit:]
+        start = max(0, len(self.task_history) - limit)
+        return [asdict(record) for record in itertools.islice(self.task_history, start, None)]
     
     def is_suitable_for_simple_mode(self, task_description: str) -> Dict[str, Any]:
         """
         Determine if a task is suitable for simple mode processing.
         """
-        task_lower = task_description.lower()
-        
-        # Indicators for simple mode suitability
-        simple_indicators = [
-            "create", "write", "add", "new file", "modify", "update", "edit", 
-            "change", "delete", "remove", "fix", "simple"
-        ]
-        
-        # Indicators for complex tasks
-        complex_indicators = [
-            "refactor", "architecture", "database", "api", "integration",
-            "deployment", "security", "performance", "scalability", "microservice"
-        ]
-        
-        simple_score = sum(1 for indicator in simple_indicators if indicator in task_lower)
-        complex_score = sum(1 for indicator in complex_indicators if indicator in task_lower)
-        
-        suitable = simple_score > 0 and complex_score <= simple_score
+        suitable, simple_score, complex_score = _suitability_core(task_description)
         
         return {
             "suitable": suitable,
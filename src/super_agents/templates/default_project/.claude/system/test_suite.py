@@ -62,6 +62,23 @@ class TestEventLogger(unittest.TestCase):
         self.assertEqual(len(replayed), 3)
         self.assertEqual(replayed[0]["type"], "EVENT1")
         self.assertEqual(replayed[2]["type"], "EVENT3")
+    
+    def test_shared_logger(self):
+        """Test shared logger reuses one descriptor per log path."""
+        shared = EventLogger.shared(str(self.log_path))
+        self.assertIs(shared, EventLogger.shared(str(self.log_path)))
+        
+        shared.append_events([
+            {"ticket_id": "TEST-001", "event_type": "EVENT1", "payload": {}},
+            {"ticket_id": "TEST-001", "event_type": "EVENT2", "payload": {}}
+        ], sync=False)
+        fd = shared._fd
+        shared.append_event("TEST-001", "EVENT3", {})
+        self.assertEqual(shared._fd, fd)
+        
+        replayed = shared.replay_events(ticket_id="TEST-001")
+        self.assertEqual([e["type"] for e in replayed], ["EVENT1", "EVENT2", "EVENT3"])
+        shared.close()
 
 class TestWorkspaceManager(unittest.TestCase):
     def setUp(self):
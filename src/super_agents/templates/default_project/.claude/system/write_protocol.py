@@ -1,15 +1,68 @@
 #!/usr/bin/env python3
 import json
 import hashlib
+import functools
 import os
 import shutil
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple
 from datetime import datetime
 from file_registry import FileRegistry
 from event_logger import EventLogger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# write_requests statuses that record a completion time
+FINAL_STATUSES = frozenset({'committed', 'failed', 'rolled_back'})
+
+# Read size used when hashing files on disk
+HASH_CHUNK_SIZE = 64 * 1024
+
+# hashlib.file_digest (Python 3.11+) hashes in C with the GIL released
+HAS_FILE_DIGEST = hasattr(hashlib, 'file_digest')
+
+# Linux-only flag for creating an unnamed file that is linked in once written
+O_TMPFILE = getattr(os, 'O_TMPFILE', None)
+
+# Payloads at least this large are hashed on worker threads when a batch
+# has several of them; OpenSSL releases the GIL while hashing
+PARALLEL_HASH_MIN_CHARS = 1 << 20
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Content up to this many characters has its hash memoized in-process, so
+# repeated writes of the same text skip SHA-256 without pinning large blobs
+CONTENT_HASH_CACHE_MAX_CHARS = 64 * 1024
+CONTENT_HASH_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=CONTENT_HASH_CACHE_SIZE)
+def _cached_content_sha256(content: str) -> str:
+    """Return the SHA-256 of text content encoded as UTF-8."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+# One hashing pool for every writer in the process, created on first use;
+# concurrent.futures joins its workers at interpreter exit
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool for hashing large payloads."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+        return _hash_pool
+
+
 class ThreePhaseWriter:
     """
     Three-Phase Write Protocol:
@@ -22,6 +75,99 @@ class ThreePhaseWriter:
         self.registry = FileRegistry()
         self.logger = EventLogger()
         
+        # Cursor reused for every write_requests row
+        self._log_cursor = self.registry.conn.cursor()
+        
+        # Reused read buffer for hashing files on disk
+        self._scratch = bytearray(HASH_CHUNK_SIZE)
+    
+    def _content_bytes(self, intent: Dict) -> bytes:
+        """Return the intent's content as UTF-8, encoding it only once."""
+        data = intent.get('_content_bytes')
+        if data is None:
+            data = intent['_content_bytes'] = intent['content'].encode('utf-8')
+        return data
+    
+    def _content_hash(self, intent: Dict) -> str:
+        """Return the SHA-256 of the intent's content, computing it only once."""
+        digest = intent.get('_content_sha256')
+        if digest is None:
+            content = intent['content']
+            if len(content) <= CONTENT_HASH_CACHE_MAX_CHARS:
+                digest = _cached_content_sha256(content)
+            else:
+                digest = hashlib.sha256(self._content_bytes(intent)).hexdigest()
+            intent['_content_sha256'] = digest
+        return digest
+    
+    def _hash_contents(self, intents: List[Dict]):
+        """Compute and cache content hashes for a batch of intents."""
+        large = [
+            intent for intent in intents
+            if '_content_sha256' not in intent and len(intent['content']) >= PARALLEL_HASH_MIN_CHARS
+        ]
+        if len(large) > 1 and HASH_WORKERS > 1:
+            list(_get_hash_pool().map(self._content_hash, large))
+        
+        for intent in intents:
+            self._content_hash(intent)
+    
+    def _serialize_intents(self, intents: List[Dict]) -> str:
+        """
+        Serialize intents for write_requests.
+        
+        Content is replaced by its hash so large payloads are not copied into
+        the log, and cached private keys are left out.
+        """
+        entries = []
+        for intent in intents:
+            entry = {k: v for k, v in intent.items() if k != 'content' and not k.startswith('_')}
+            if isinstance(intent.get('content'), str):
+                entry['content_sha256'] = self._content_hash(intent)
+            entries.append(entry)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(entries, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(entries)
+    
+    def _path_exists(self, seen: Dict[str, bool], path: str) -> bool:
+        """Check whether a path exists, remembering the answer in seen."""
+        exists = seen.get(path)
+        if exists is None:
+            # os.path.exists, not a directory listing, so case-insensitive
+            # filesystems and dangling symlinks behave as Path.exists did
+            exists = seen[path] = os.path.exists(path)
+        return exists
+    
+    def _stat_unchanged(self, path: str, intent: Dict) -> bool:
+        """Check the optional stat_before {mtime_ns, size} snapshot against the file."""
+        stat_before = intent.get('stat_before')
+        if not stat_before:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (st.st_mtime_ns == stat_before.get('mtime_ns')
+                and st.st_size == stat_before.get('size'))
+    
+    def _hash_file(self, path: Path) -> str:
+        """Return the SHA-256 of a file, read in fixed-size chunks."""
+        if HAS_FILE_DIGEST:
+            with open(path, 'rb', buffering=0) as f:
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        # Read straight into the reused scratch buffer, unbuffered
+        digest = hashlib.sha256()
+        view = memoryview(self._scratch)
+        with open(path, 'rb', buffering=0) as f:
+            readinto = f.readinto
+            while True:
+                n = readinto(view)
+                if not n:
+                    break
+                digest.update(view[:n])
+        return digest.hexdigest()
+        
     def phase1_plan(self, intents: List[Dict], ticket_id: str) -> Tuple[List[Dict], List[str]]:
         """
         Phase 1: Plan and validate write intents.
@@ -31,15 +177,22 @@ class ThreePhaseWriter:
         errors = []
         request_id = str(uuid.uuid4())
         
-        # Log the start of write request
-        self._log_write_request(request_id, ticket_id, 1, intents, "pending")
+        # Hash every create payload in one sweep; the loop below reads the cache
+        self._hash_contents([
+            intent for intent in intents
+            if intent['operation'] == 'create' and 'content' in intent
+        ])
+        
+        validate_path = self.registry.validate_path
+        check_duplicate = self.registry.check_duplicate
+        acquire_lock = self.registry.acquire_lock
         
         for intent in intents:
             path = intent['path']
             operation = intent['operation']
             
             # Validate path
-            valid, message = self.registry.validate_path(path)
+            valid, message = validate_path(path)
             if not valid:
                 errors.append(f"{path}: {message}")
                 intent['validation_status'] = 'rejected'
@@ -48,11 +201,9 @@ class ThreePhaseWriter:
             
             # Check for duplicates (for create operations)
             if operation == 'create' and 'content' in intent:
-                content_hash = hashlib.sha256(
-                    intent['content'].encode()
-                ).hexdigest()
+                content_hash = self._content_hash(intent)
                 
-                duplicate_path = self.registry.check_duplicate(content_hash)
+                duplicate_path = check_duplicate(content_hash)
                 if duplicate_path:
                     errors.append(f"{path}: Duplicate content exists at {duplicate_path}")
                     intent['validation_status'] = 'rejected'
@@ -60,7 +211,7 @@ class ThreePhaseWriter:
                     continue
             
             # Try to acquire lock
-            if not self.registry.acquire_lock(path, ticket_id):
+            if not acquire_lock(path, ticket_id):
                 errors.append(f"{path}: Could not acquire lock")
                 intent['validation_status'] = 'rejected'
                 intent['rejection_reason'] = "Lock unavailable"
@@ -75,10 +226,12 @@ class ThreePhaseWriter:
             intent['request_id'] = request_id
             validated.append(intent)
         
-        # Update request status
+        # Log the phase outcome (no separate pending row for phases 1-2)
         status = "validated" if not errors else "failed"
-        self._log_write_request(request_id, ticket_id, 1, validated, status, 
+        self._log_write_request(request_id, ticket_id, 1,
+                               self._serialize_intents(validated), status,
                                "; ".join(errors) if errors else None)
+        self._flush_log()
         
         return validated, errors
     
@@ -88,30 +241,29 @@ class ThreePhaseWriter:
         Returns: (all_valid, errors)
         """
         errors = []
-        workspace = Path(workspace_path)
         request_id = intents[0]['request_id'] if intents else str(uuid.uuid4())
         
-        # Log phase 2 start
-        self._log_write_request(request_id, intents[0].get('ticket_id', ''), 2, intents, "pending")
+        # Phase 2 only reads, so each path is checked once and reused
+        seen = {}
         
         for intent in intents:
             if intent['validation_status'] != 'validated':
                 continue
             
-            path = workspace / intent['path']
+            path = os.path.join(workspace_path, intent['path'])
             operation = intent['operation']
             
             if operation == 'update' or operation == 'delete':
                 # File must exist
-                if not path.exists():
+                if not self._path_exists(seen, path):
                     errors.append(f"{intent['path']}: File does not exist for {operation}")
                     intent['validation_status'] = 'rejected'
                     continue
                 
-                # Verify hash matches (prevent concurrent modification)
-                if 'content_hash_before' in intent:
-                    with open(path, 'rb') as f:
-                        actual_hash = hashlib.sha256(f.read()).hexdigest()
+                # Verify hash matches (prevent concurrent modification);
+                # an unchanged size and mtime from the caller's read skips the hash
+                if 'content_hash_before' in intent and not self._stat_unchanged(path, intent):
+                    actual_hash = self._hash_file(path)
                     
                     if actual_hash != intent['content_hash_before']:
                         errors.append(f"{intent['path']}: File modified since read")
@@ -120,7 +272,7 @@ class ThreePhaseWriter:
             
             elif operation == 'create':
                 # File must not exist
-                if path.exists():
+                if self._path_exists(seen, path):
                     errors.append(f"{intent['path']}: File already exists")
                     intent['validation_status'] = 'rejected'
                     continue
@@ -128,16 +280,18 @@ class ThreePhaseWriter:
             # Check dependencies if specified
             if 'dependencies' in intent:
                 for dep_path in intent['dependencies']:
-                    dep_full_path = workspace / dep_path
-                    if not dep_full_path.exists():
+                    dep_full_path = os.path.join(workspace_path, dep_path)
+                    if not self._path_exists(seen, dep_full_path):
                         errors.append(f"{intent['path']}: Dependency {dep_path} not found")
                         intent['validation_status'] = 'rejected'
                         break
         
-        # Update request status
+        # Log the phase outcome (no separate pending row for phases 1-2)
         status = "validated" if not errors else "failed"
-        self._log_write_request(request_id, intents[0].get('ticket_id', ''), 2, intents, status,
+        self._log_write_request(request_id, intents[0].get('ticket_id', ''), 2,
+                               self._serialize_intents(intents), status,
                                "; ".join(errors) if errors else None)
+        self._flush_log()
         
         return len(errors) == 0, errors
     
@@ -151,106 +305,137 @@ class ThreePhaseWriter:
         Phase 3: Apply validated intents atomically.
         Returns: (success, results)
         """
-        workspace = Path(workspace_path)
         results = []
         applied = []
         request_id = intents[0]['request_id'] if intents else str(uuid.uuid4())
         
-        # Log phase 3 start
-        self._log_write_request(request_id, ticket_id, 3, intents, "pending")
+        # Log phase 3 start; committed now so an interrupted apply is visible
+        self._log_write_request(request_id, ticket_id, 3,
+                               self._serialize_intents(intents), "pending")
+        self._flush_log()
+        
+        # Backup directory for rollback; created with the first backup taken
+        backup_dir = os.path.join(workspace_path, '.backup', request_id)
+        backed_up = False
         
-        # Create backup directory for rollback
-        backup_dir = workspace / '.backup' / request_id
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        events = []
+        registrations = []
+        changed_dirs = set()
+        created_dirs = set()
         
         try:
+            # Hash payloads up front so large ones can be hashed in parallel
+            self._hash_contents([
+                intent for intent in intents
+                if intent['validation_status'] == 'validated'
+                and intent['operation'] in ('create', 'update')
+            ])
+            
             for intent in intents:
                 if intent['validation_status'] != 'validated':
                     continue
                 
-                path = workspace / intent['path']
+                # Plain string paths keep Path construction out of the loop
+                path = os.path.join(workspace_path, intent['path'])
+                parent = os.path.dirname(path)
                 operation = intent['operation']
                 
                 # Create parent directories if needed
-                path.parent.mkdir(parents=True, exist_ok=True)
+                if parent not in created_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    created_dirs.add(parent)
                 
                 # Backup existing file if it exists
-                if path.exists():
-                    backup_path = backup_dir / intent['path']
-                    backup_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(path, backup_path)
+                if os.path.exists(path):
+                    backup_path = os.path.join(backup_dir, intent['path'])
+                    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+                    backed_up = True
+                    # Writes replace the file by rename and deletes unlink it,
+                    # so a hard link keeps the original inode intact
+                    try:
+                        os.link(path, backup_path)
+                    except OSError:
+                        shutil.copy2(path, backup_path)
                 
                 if operation == 'create' or operation == 'update':
-                    # Write content atomically (write to temp, then rename)
-                    temp_path = path.with_suffix('.tmp')
-                    with open(temp_path, 'w') as f:
-                        f.write(intent['content'])
+                    # Hash the bytes being written instead of reading them back
+                    data = self._content_bytes(intent)
+                    content_hash = self._content_hash(intent)
                     
-                    # Calculate final hash
-                    with open(temp_path, 'rb') as f:
-                        content_hash = hashlib.sha256(f.read()).hexdigest()
+                    # Write content atomically; the directory entry is synced after the loop
+                    self._atomic_write_bytes(path, data, replace=operation == 'update')
+                    changed_dirs.add(parent)
                     
-                    # Atomic rename
-                    temp_path.rename(path)
-                    
-                    # Register in database
-                    event_id = self.logger.append_event(
-                        ticket_id=ticket_id,
-                        event_type=f"FILE_{operation.upper()}",
-                        payload={
+                    # Events and registrations are written together after the loop
+                    events.append({
+                        "ticket_id": ticket_id,
+                        "event_type": f"FILE_{operation.upper()}",
+                        "payload": {
                             "path": str(intent['path']),
                             "hash": content_hash,
                             "request_id": request_id
                         },
-                        agent=agent_name
-                    )
-                    
-                    self.registry.register_file(
-                        str(intent['path']),
-                        content_hash,
-                        ticket_id,
-                        job_id,
-                        agent_name,
-                        event_id,
-                        intent.get('component'),
-                        intent.get('dependencies')
-                    )
+                        "agent": agent_name
+                    })
+                    registrations.append({
+                        "path": str(intent['path']),
+                        "content_hash": content_hash,
+                        "ticket_id": ticket_id,
+                        "job_id": job_id,
+                        "agent_name": agent_name,
+                        "component": intent.get('component'),
+                        "dependencies": intent.get('dependencies'),
+                        "event_index": len(events) - 1
+                    })
                     
                     results.append(f"{operation} {intent['path']}: Success")
                     applied.append(intent)
                     
                 elif operation == 'delete':
                     # Delete file
-                    path.unlink()
+                    os.unlink(path)
+                    changed_dirs.add(parent)
                     
                     # Log deletion
-                    event_id = self.logger.append_event(
-                        ticket_id=ticket_id,
-                        event_type="FILE_DELETED",
-                        payload={
+                    events.append({
+                        "ticket_id": ticket_id,
+                        "event_type": "FILE_DELETED",
+                        "payload": {
                             "path": str(intent['path']),
                             "request_id": request_id
                         },
-                        agent=agent_name
-                    )
+                        "agent": agent_name
+                    })
                     
                     results.append(f"delete {intent['path']}: Success")
                     applied.append(intent)
             
+            # Make renames and unlinks durable, once per directory
+            for directory in changed_dirs:
+                self._fsync_directory(directory)
+            
+            # Log all file events with one write, then register files in one transaction
+            event_ids = self.logger.append_events(events)
+            for registration in registrations:
+                registration["event_id"] = event_ids[registration.pop("event_index")]
+            if registrations:
+                self.registry.register_files(registrations)
+            
             # Log successful completion
-            self._log_write_request(request_id, ticket_id, 3, intents, "committed")
+            self._update_write_request(request_id, "committed")
             
             # Clean up backup directory on success
-            shutil.rmtree(backup_dir, ignore_errors=True)
+            if backed_up:
+                shutil.rmtree(backup_dir, ignore_errors=True)
             
             return True, results
             
         except Exception as e:
             # Rollback on error
-            self._rollback_changes(applied, backup_dir, workspace)
+            self._rollback_changes(applied, backup_dir, workspace_path)
             
             # Log rollback
-            self._log_write_request(request_id, ticket_id, 3, intents, "rolled_back", str(e))
+            self._update_write_request(request_id, "rolled_back", str(e))
             
             return False, [f"Rollback due to error: {str(e)}"]
         
@@ -258,37 +443,103 @@ class ThreePhaseWriter:
             # Release all locks
             for intent in intents:
                 self.registry.release_lock(intent['path'], ticket_id)
+            self._flush_log()
+    
+    def _atomic_write_bytes(self, path: str, data: bytes, replace: bool):
+        """
+        Write and fsync data so that path only ever shows complete content.
+        
+        New files are written to an unnamed O_TMPFILE inode and linked into
+        place where the platform allows it. Otherwise, and for replacements,
+        a uniquely named temp file is renamed over the target, so concurrent
+        writers never share a temp path.
+        """
+        parent, name = os.path.split(path)
+        parent = parent or '.'
+        if O_TMPFILE is not None and not replace:
+            try:
+                fd = os.open(parent, O_TMPFILE | os.O_WRONLY, 0o666)
+                try:
+                    self._write_fd(fd, data)
+                    os.link(f"/proc/self/fd/{fd}", path)
+                    return
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass  # No O_TMPFILE support here, or the target appeared
+        
+        temp_path = os.path.join(parent, f".{name}.{uuid.uuid4().hex}.tmp")
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            try:
+                self._write_fd(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
     
-    def _rollback_changes(self, applied: List[Dict], backup_dir: Path, workspace: Path):
+    def _write_fd(self, fd: int, data: bytes):
+        """Write all of data to fd and fsync it."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    
+    def _fsync_directory(self, directory: str):
+        """Flush a directory's entries so renames and unlinks survive a crash."""
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _rollback_changes(self, applied: List[Dict], backup_dir: str, workspace: str):
         """Rollback applied changes using backups."""
         for intent in applied:
-            path = workspace / intent['path']
-            backup_path = backup_dir / intent['path']
+            path = os.path.join(workspace, intent['path'])
+            backup_path = os.path.join(backup_dir, intent['path'])
             
-            if backup_path.exists():
-                # Restore from backup
-                path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(backup_path, path)
-            elif path.exists() and intent['operation'] == 'create':
+            if os.path.exists(backup_path):
+                # Restore from backup by renaming it back into place
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    os.replace(backup_path, path)
+                except OSError:
+                    shutil.copy2(backup_path, path)
+            elif os.path.exists(path) and intent['operation'] == 'create':
                 # Remove newly created file
-                path.unlink()
+                os.unlink(path)
     
     def _log_write_request(self, request_id: str, ticket_id: str, phase: int, 
-                          intents: List[Dict], status: str, error_message: str = None):
-        """Log write request status to database."""
-        cursor = self.registry.conn.cursor()
+                          intents_json: str, status: str, error_message: str = None):
+        """Log write request status; committed by _flush_log at phase end."""
+        completed_at = datetime.now().isoformat() if status in FINAL_STATUSES else None
         
-        cursor.execute("""
+        self._log_cursor.execute("""
             INSERT OR REPLACE INTO write_requests
             (request_id, ticket_id, phase, status, intents_json, 
              completed_at, error_message)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (
-            request_id, ticket_id, phase, status, json.dumps(intents),
-            datetime.now().isoformat() if status in ['committed', 'failed', 'rolled_back'] else None,
-            error_message
+            request_id, ticket_id, phase, status, intents_json,
+            completed_at, error_message
         ))
-        
+    
+    def _update_write_request(self, request_id: str, status: str, error_message: str = None):
+        """Record the final status of a pending request without rewriting its intents."""
+        self._log_cursor.execute("""
+            UPDATE write_requests
+            SET status = ?, completed_at = ?, error_message = ?
+            WHERE request_id = ?
+        """, (status, datetime.now().isoformat(), error_message, request_id))
+    
+    def _flush_log(self):
+        """Commit write_requests rows logged during the current phase."""
         self.registry.conn.commit()
     
     def get_write_history(self, ticket_id: str) -> List[Dict]: